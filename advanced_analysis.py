@@ -1,14 +1,13 @@
-import json
+import numpy as np
 from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+from org_data import NO_MANAGER, OrgData, load_records
 
-def load_data() -> List[Dict]:
-    with open('company_structure.json', 'r') as f:
-        return json.load(f)
+def load_data(json_path: str = 'company_structure.json') -> List[Dict]:
+    return load_records(json_path)
 
 class OrganizationAnalyzer:
     def __init__(self, employees_data: List[Dict]):
-        self.employees = employees_data
         self.skill_groups = {
             'Technical': {
                 'Software Engineer', 'DevOps Engineer', 'Systems Administrator',
@@ -28,68 +27,88 @@ class OrganizationAnalyzer:
             }
         }
 
-    def analyze_skill_distribution(self) -> Dict:
+        # Reverse map: position -> skill groups it belongs to
+        self.position_groups: Dict[str, Tuple[str, ...]] = defaultdict(tuple)
+        for group, roles in self.skill_groups.items():
+            for role in roles:
+                self.position_groups[role] += (group,)
+
+        self.set_employees(employees_data)
+
+    def set_employees(self, employees_data: List[Dict]):
+        """Replace the org data, rebuilding the indexes and dropping cached results."""
+        self.employees = employees_data
+        self._cache: Dict[str, object] = {}
+
+        # Manager -> direct reports, in org order
+        self.team_members: Dict[int, List[Dict]] = defaultdict(list)
+        for emp in self.employees:
+            if emp.get('manager_id') is not None:
+                self.team_members[emp['manager_id']].append(emp)
+
+    def _team_profiles(self) -> Dict:
+        """One pass over the org collecting every per-group and per-team count."""
+        if 'profiles' in self._cache:
+            return self._cache['profiles']
+
         distribution = defaultdict(lambda: defaultdict(int))
-        
+        team_skill_counts = defaultdict(lambda: defaultdict(int))
+        team_specialist_roles = defaultdict(set)
+
         for emp in self.employees:
-            if 'Manager' not in emp['position']:
-                for group, roles in self.skill_groups.items():
-                    if emp['position'] in roles:
-                        distribution[group]['total'] += 1
-                        distribution[group][emp['position']] += 1
-        
-        return distribution
+            position = emp['position']
+            manager_id = emp.get('manager_id')
+            if 'Manager' not in position:
+                team_specialist_roles[manager_id].add(position)
+                for group in self.position_groups.get(position, ()):
+                    distribution[group]['total'] += 1
+                    distribution[group][position] += 1
+                    team_skill_counts[manager_id][group] += 1
+
+        profiles = {
+            'distribution': distribution,
+            'team_skill_counts': team_skill_counts,
+            'team_specialist_roles': team_specialist_roles,
+        }
+        self._cache['profiles'] = profiles
+        return profiles
+
+    def analyze_skill_distribution(self) -> Dict:
+        return self._team_profiles()['distribution']
 
     def analyze_team_diversity(self) -> List[Dict]:
+        if 'diversity' in self._cache:
+            return self._cache['diversity']
+        profiles = self._team_profiles()
         team_stats = []
         
         # Get all Level 1 managers
         managers = [emp for emp in self.employees if 'Level 1' in emp['position']]
         
         for manager in managers:
-            team = [emp for emp in self.employees if emp.get('manager_id') == manager['id']]
-            
-            # Count roles in each skill group
-            skill_counts = defaultdict(int)
-            roles = set()
-            
-            for member in team:
-                if 'Manager' not in member['position']:
-                    roles.add(member['position'])
-                    for group, group_roles in self.skill_groups.items():
-                        if member['position'] in group_roles:
-                            skill_counts[group] += 1
-            
             team_stats.append({
                 'manager_id': manager['id'],
-                'team_size': len(team),
-                'unique_roles': len(roles),
-                'skill_distribution': dict(skill_counts)
+                'team_size': len(self.team_members.get(manager['id'], [])),
+                'unique_roles': len(profiles['team_specialist_roles'].get(manager['id'], ())),
+                'skill_distribution': dict(profiles['team_skill_counts'].get(manager['id'], {}))
             })
         
+        self._cache['diversity'] = team_stats
         return team_stats
 
-    def find_collaboration_opportunities(self) -> List[Dict]:
-        # Find teams that could benefit from cross-team collaboration
-        teams = defaultdict(list)
-        for emp in self.employees:
-            if emp['manager_id']:
-                teams[emp['manager_id']].append(emp)
+    def skill_gap_matrix(self) -> 'SkillGapMatrix':
+        if 'skill_gap_matrix' not in self._cache:
+            self._cache['skill_gap_matrix'] = SkillGapMatrix.from_records(self.employees, self.skill_groups)
+        return self._cache['skill_gap_matrix']
 
-        opportunities = []
-        for manager_id, team in teams.items():
-            skill_gaps = self.analyze_team_skill_gaps(team)
-            if skill_gaps:
-                opportunities.append({
-                    'team_id': manager_id,
-                    'team_size': len(team),
-                    'skill_gaps': skill_gaps
-                })
-        
-        return opportunities
+    def find_collaboration_opportunities(self, top: Optional[int] = None) -> List[Dict]:
+        # Find teams that could benefit from cross-team collaboration, most in need first
+        return self.skill_gap_matrix().ranked_opportunities(top)
 
     def analyze_team_skill_gaps(self, team: List[Dict]) -> List[str]:
-        team_roles = {emp['position'] for emp in team}
+        return self._skill_gaps({emp['position'] for emp in team})
+
+    def _skill_gaps(self, team_roles: Set[str]) -> List[str]:
         gaps = []
         
         # Check for missing key roles in each skill group
@@ -102,10 +121,141 @@ class OrganizationAnalyzer:
         
         return gaps
 
-def print_advanced_analysis():
+class SkillGapMatrix:
+    """Team x role count matrix with vectorised gap, coverage and partner scores.
+
+    Teams are a manager's direct reports. Positions and skill groups are
+    encoded as integer codes, so gaps, coverage and partner suggestions are
+    matrix operations over every team at once.
+    """
+
+    # A team should hold at least this many distinct roles from each group
+    MIN_ROLES_PER_GROUP = 2
+
+    def __init__(self, team_ids: np.ndarray, member_team: np.ndarray, member_role: np.ndarray,
+                 roles: List[str], skill_groups: Dict[str, Set[str]]):
+        self.team_ids = team_ids
+        self.roles = roles
+        self.groups = list(skill_groups)
+        num_teams, num_roles = len(team_ids), len(roles)
+
+        self.counts = np.bincount(member_team * num_roles + member_role,
+                                  minlength=num_teams * num_roles).reshape(num_teams, num_roles)
+        self.team_size = self.counts.sum(axis=1)
+
+        role_index = {role: i for i, role in enumerate(roles)}
+        self.group_roles = np.zeros((num_roles, len(self.groups)), dtype=bool)
+        self.group_role_names = []
+        for g, group in enumerate(self.groups):
+            members = sorted(skill_groups[group])
+            self.group_role_names.append(members)
+            for role in members:
+                if role in role_index:
+                    self.group_roles[role_index[role], g] = True
+        group_sizes = np.array([len(skill_groups[group]) for group in self.groups])
+
+        # Members in a skill-group role; teams of only managers have none
+        self.contributors = self.counts @ self.group_roles.any(axis=1)
+
+        present = self.counts > 0
+        self.present = present
+        self.roles_per_group = present.astype(np.int64) @ self.group_roles
+        self.coverage = self.roles_per_group / group_sizes
+        # Same rule as OrganizationAnalyzer.analyze_team_skill_gaps
+        self.gaps = ((self.roles_per_group < self.MIN_ROLES_PER_GROUP) &
+                     (self.roles_per_group < group_sizes))
+        self.gap_severity = (np.maximum(self.MIN_ROLES_PER_GROUP - self.roles_per_group, 0) *
+                             self.gaps).sum(axis=1)
+        # Roles a team lacks from the groups it has gaps in
+        self.missing = ~present & ((self.gaps.astype(np.int64) @ self.group_roles.T) > 0)
+
+    @classmethod
+    def from_records(cls, employees: List[Dict], skill_groups: Dict[str, Set[str]]) -> 'SkillGapMatrix':
+        team_codes: Dict[int, int] = {}
+        role_codes: Dict[str, int] = {}
+        member_team, member_role = [], []
+        for emp in employees:
+            # Same membership rule as from_org: anyone with a manager
+            if emp.get('manager_id') is not None:
+                member_team.append(team_codes.setdefault(emp['manager_id'], len(team_codes)))
+                member_role.append(role_codes.setdefault(emp['position'], len(role_codes)))
+        return cls(np.array(list(team_codes), dtype=np.int64),
+                   np.array(member_team, dtype=np.int64), np.array(member_role, dtype=np.int64),
+                   list(role_codes), skill_groups)
+
+    @classmethod
+    def from_org(cls, org: OrgData, skill_groups: Dict[str, Set[str]]) -> 'SkillGapMatrix':
+        members = np.flatnonzero(org.manager_id != NO_MANAGER)
+        team_ids, member_team = np.unique(org.manager_id[members], return_inverse=True)
+        return cls(team_ids.astype(np.int64), member_team.astype(np.int64),
+                   org.position_code[members].astype(np.int64), list(org.positions), skill_groups)
+
+    def coverage_score(self) -> np.ndarray:
+        """Mean share of each skill group's roles present in every team."""
+        return self.coverage.mean(axis=1)
+
+    def best_partners(self, teams: np.ndarray, chunk_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+        """For each team in `teams`, the other team holding most of its missing roles.
+
+        Returns partner team rows (-1 when nobody can help) and how many
+        missing roles the partner covers. Scored in chunks of a
+        (chunk x teams) matrix product to bound memory.
+        """
+        partners = np.full(len(teams), -1, dtype=np.int64)
+        covered = np.zeros(len(teams), dtype=np.int64)
+        present = self.present.astype(np.float32)
+        for start in range(0, len(teams), chunk_size):
+            rows = teams[start:start + chunk_size]
+            scores = self.missing[rows].astype(np.float32) @ present.T
+            scores[np.arange(len(rows)), rows] = -1
+            best = scores.argmax(axis=1)
+            best_score = scores[np.arange(len(rows)), best].astype(np.int64)
+            partners[start:start + len(rows)] = np.where(best_score > 0, best, -1)
+            covered[start:start + len(rows)] = np.maximum(best_score, 0)
+        return partners, covered
+
+    def gap_descriptions(self, team: int) -> List[str]:
+        """Human-readable gaps for one team row, in the analyzer's wording."""
+        gaps = []
+        for g in np.flatnonzero(self.gaps[team]):
+            missing = [role for role in self.group_role_names[g]
+                       if role not in self.roles or not self.present[team, self.roles.index(role)]]
+            gaps.append(f"Need more {self.groups[g]} roles (missing: {', '.join(missing[:2])})")
+        return gaps
+
+    def ranked_teams(self) -> np.ndarray:
+        """Rows of teams with skill gaps, most severe first (ties: larger teams first).
+
+        Teams without contributors (e.g. a director's direct reports, who are
+        all managers) have every gap by construction and are left out.
+        """
+        teams = np.flatnonzero(self.gaps.any(axis=1) & (self.contributors > 0))
+        return teams[np.lexsort((-self.team_size[teams], -self.gap_severity[teams]))]
+
+    def ranked_opportunities(self, top: Optional[int] = None) -> List[Dict]:
+        """Teams with skill gaps in `ranked_teams` order, with their best partner."""
+        teams = self.ranked_teams()[:top]
+        partners, covered = self.best_partners(teams)
+        coverage = self.coverage_score()
+
+        opportunities = []
+        for team, partner, partner_covers in zip(teams, partners, covered):
+            opportunities.append({
+                'team_id': int(self.team_ids[team]),
+                'team_size': int(self.team_size[team]),
+                'skill_gaps': self.gap_descriptions(team),
+                'gap_severity': int(self.gap_severity[team]),
+                'coverage_score': float(coverage[team]),
+                'best_partner_team': int(self.team_ids[partner]) if partner >= 0 else None,
+                'partner_covers': int(partner_covers),
+            })
+        return opportunities
+
+def print_advanced_analysis(analyzer: Optional[OrganizationAnalyzer] = None):
     print("\n=== ADVANCED ORGANIZATIONAL ANALYSIS ===\n")
     
-    analyzer = OrganizationAnalyzer(load_data())
+    if analyzer is None:
+        analyzer = OrganizationAnalyzer(load_data())
     
     # 1. Skill Distribution Analysis
     print("1. SKILL DISTRIBUTION ACROSS ORGANIZATION")
@@ -154,9 +304,12 @@ def print_advanced_analysis():
     
     print("\nTeams that could benefit from cross-team collaboration:")
     for opp in opportunities[:5]:  # Show top 5 opportunities
-        print(f"\nTeam {opp['team_id']} (Size: {opp['team_size']})")
+        print(f"\nTeam {opp['team_id']} (Size: {opp['team_size']}, Coverage: {opp['coverage_score']:.0%})")
         for gap in opp['skill_gaps']:
             print(f"  - {gap}")
+        if opp['best_partner_team'] is not None:
+            print(f"  Suggested partner: Team {opp['best_partner_team']} "
+                  f"(covers {opp['partner_covers']} missing roles)")
 
 if __name__ == "__main__":
     print_advanced_analysis()
@@ -1,63 +1,163 @@
-import json
+import numpy as np
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+from org_data import OrgData, load_org
 
-def analyze_company_structure():
+class ReportingChains:
+    """Reporting-chain queries backed by an id->index map and ancestor tables.
+
+    The tables are built by pointer jumping: ``up[k][i]`` is the 2**k-th
+    manager of row i (roots point at themselves). Depth comes out of the
+    same pass, so depth is O(1), k-th manager and lowest common manager
+    are O(log depth), and a full chain costs only its own length.
+    """
+
+    def __init__(self, org: OrgData):
+        self.org = org
+        parent = org.parent_index
+        rows = np.arange(len(org))
+        ancestor = np.where(parent >= 0, parent, rows)
+        depth = (parent >= 0).astype(np.int64)
+
+        self.up: List[np.ndarray] = [ancestor]
+        for _ in range(max(len(org), 1).bit_length() + 1):
+            jumped = ancestor[ancestor]
+            if np.array_equal(jumped, ancestor):
+                break
+            depth = depth + depth[ancestor]
+            ancestor = jumped
+            self.up.append(ancestor)
+        else:
+            raise ValueError("Reporting structure contains a cycle")
+
+        self.parent = parent
+        self.depth = depth
+        self.root = ancestor
+
+    def _index(self, emp_id: int) -> int:
+        index = int(self.org.index_of(emp_id))
+        if index < 0:
+            raise KeyError(f"Unknown employee id {emp_id}")
+        return index
+
+    def depth_of(self, emp_id: int) -> int:
+        """Number of managers above an employee."""
+        return int(self.depth[self._index(emp_id)])
+
+    def kth_manager(self, index: int, k: int) -> int:
+        """Row of the k-th manager above row `index` (the root if k is past it)."""
+        level = 0
+        while k and level < len(self.up):
+            if k & 1:
+                index = int(self.up[level][index])
+            k >>= 1
+            level += 1
+        return index if not k else int(self.root[index])
+
+    def chain_indices(self, index: int) -> np.ndarray:
+        """Rows from `index` up to the top of its org, bottom first."""
+        chain = np.empty(self.depth[index] + 1, dtype=np.int64)
+        for step in range(len(chain)):
+            chain[step] = index
+            index = self.parent[index]
+        return chain
+
+    def chain(self, emp_id: int) -> List[str]:
+        """Position titles from an employee up to the top, bottom first."""
+        positions = self.org.positions
+        return [positions[code] for code in self.org.position_code[self.chain_indices(self._index(emp_id))]]
+
+    def lowest_common_manager(self, first_id: int, second_id: int) -> Optional[int]:
+        """Id of the closest employee both report up to (either may be that employee)."""
+        a, b = self._index(first_id), self._index(second_id)
+        if self.root[a] != self.root[b]:
+            return None
+        if self.depth[a] < self.depth[b]:
+            a, b = b, a
+        a = self.kth_manager(a, int(self.depth[a] - self.depth[b]))
+        if a != b:
+            for level in range(len(self.up) - 1, -1, -1):
+                if self.up[level][a] != self.up[level][b]:
+                    a, b = int(self.up[level][a]), int(self.up[level][b])
+            a = int(self.parent[a])
+        return int(self.org.ids[a])
+
+    def all_chains(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Chains for every employee at once, as CSR arrays.
+
+        Returns ``(offsets, rows)``: the chain of row i (bottom first) is
+        ``rows[offsets[i]:offsets[i + 1]]``. Filled level by level with one
+        vectorised step per level of the deepest chain.
+        """
+        lengths = self.depth + 1
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        rows = np.empty(offsets[-1], dtype=np.int64)
+
+        current = np.arange(len(lengths))
+        active = current
+        for step in range(int(lengths.max()) if len(lengths) else 0):
+            rows[offsets[active] + step] = current
+            keep = lengths[active] > step + 1
+            active, current = active[keep], self.parent[current[keep]]
+        return offsets, rows
+
+def analyze_company_structure(org: Optional[OrgData] = None, chains: Optional[ReportingChains] = None):
     # Load the company structure data
-    with open('company_structure.json', 'r') as f:
-        employees = json.load(f)
-    
+    if org is None:
+        org = load_org('company_structure.json')
+    positions_by_code = org.positions
+
     # Analyze position distribution
-    positions = Counter(emp['position'] for emp in employees)
-    
+    position_counts = np.bincount(org.position_code, minlength=len(positions_by_code))
+    positions = Counter({position: int(count) for position, count in zip(positions_by_code, position_counts) if count})
+
     # Analyze management structure
-    management_levels = Counter(emp['level'] for emp in employees)
-    
+    levels, level_counts = np.unique(org.level, return_counts=True)
+    management_levels = Counter(dict(zip(levels.tolist(), level_counts.tolist())))
+
     # Analyze span of control
-    span_of_control = Counter(len(emp['subordinates']) for emp in employees if emp['subordinates'])
-    
+    parents = org.parent_index
+    direct_reports = np.bincount(parents[parents >= 0], minlength=len(org))
+    spans, span_counts = np.unique(direct_reports[direct_reports > 0], return_counts=True)
+    span_of_control = Counter(dict(zip(spans.tolist(), span_counts.tolist())))
+
     # Find the reporting chains
-    def find_chain(emp_id):
-        chain = []
-        current = next(emp for emp in employees if emp['id'] == emp_id)
-        while current['manager_id'] is not None:
-            chain.append(current['position'])
-            current = next(emp for emp in employees if emp['id'] == current['manager_id'])
-        chain.append(current['position'])
-        return chain
-    
+    if chains is None:
+        chains = ReportingChains(org)
+
     # Get a sample reporting chain
-    sample_emp = next(emp for emp in employees if emp['level'] == 0)
-    sample_chain = find_chain(sample_emp['id'])
-    
+    sample_emp = int(org.ids[np.flatnonzero(org.level == 0)[0]])
+    sample_chain = chains.chain(sample_emp)
+
     # Print detailed analysis
     print("\n=== DETAILED COMPANY ANALYSIS ===\n")
-    
+
     print("POSITION DISTRIBUTION:")
     for position, count in sorted(positions.items()):
         if "Manager" not in position and "CEO" not in position:
             print(f"{position}: {count} employees")
-    
+
     print("\nMANAGEMENT STRUCTURE:")
     for level, count in sorted(management_levels.items()):
         print(f"Level {level}: {count} employees")
-    
+
     print("\nMANAGERIAL SPAN OF CONTROL:")
     for span, count in sorted(span_of_control.items()):
         print(f"Managers with {span} direct reports: {count}")
-    
+
     print("\nSAMPLE REPORTING CHAIN (bottom to top):")
     for i, position in enumerate(sample_chain):
         print(f"Level {i}: {position}")
-    
+
     # Find the largest and smallest teams
-    team_sizes = [(emp['id'], len(emp['subordinates'])) for emp in employees if emp['subordinates']]
-    largest_team = max(team_sizes, key=lambda x: x[1])
-    smallest_team = min(team_sizes, key=lambda x: x[1])
-    
+    managers = np.flatnonzero(direct_reports > 0)
+    largest = managers[np.argmax(direct_reports[managers])]
+    smallest = managers[np.argmin(direct_reports[managers])]
+
     print("\nTEAM SIZE ANALYSIS:")
-    print(f"Largest team size: {largest_team[1]} (Manager ID: {largest_team[0]})")
-    print(f"Smallest team size: {smallest_team[1]} (Manager ID: {smallest_team[0]})")
+    print(f"Largest team size: {direct_reports[largest]} (Manager ID: {org.ids[largest]})")
+    print(f"Smallest team size: {direct_reports[smallest]} (Manager ID: {org.ids[smallest]})")
 
 if __name__ == "__main__":
     analyze_company_structure()
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import numpy as np
+from advanced_analysis import OrganizationAnalyzer
+from analyze_structure import ReportingChains
+from company_structure import generate_synthetic_org
+from detailed_analysis import CompactOrgTree, build_org_tree
+from employee_survey_analysis import EmployeeSurveySystem
+from org_data import OrgData
+
+SIZES = (500, 10_000, 100_000, 1_000_000)
+HISTORY_FILE = 'benchmark_history.json'
+
+# A result is a regression when it is this much worse than the previous run
+# and the difference is above the noise floor
+REGRESSION_THRESHOLD = 0.25
+MIN_SECONDS_DELTA = 0.01
+MIN_BYTES_DELTA = 1 << 20
+
+# Staff roles of company_structure.json, used for company-like synthetic orgs
+COMPANY_ROLES = [
+    'Software Engineer', 'DevOps Engineer', 'Systems Administrator', 'Data Analyst',
+    'UX Designer', 'Quality Assurance', 'Business Analyst', 'Sales Representative',
+    'Marketing Specialist', 'Product Manager', 'Account Manager', 'Project Manager',
+    'Operations Specialist', 'HR Coordinator', 'Executive Assistant', 'Customer Support',
+    'Legal Counsel', 'Financial Analyst', 'Research Analyst', 'Content Writer'
+]
+
+CHAIN_SAMPLE = 1000
+
+def company_org(size: int, seed: int = 0) -> OrgData:
+    """A company_structure.json-like org (CEO, Level 2/Level 1 managers, staff)."""
+    org = generate_synthetic_org(size, depth=3, span_mean=max(2.0, size ** (1 / 3)), seed=seed)
+    rng = np.random.default_rng(seed)
+    positions = ['CEO', 'Level 1 Manager', 'Level 2 Manager', *COMPANY_ROLES]
+    position_code = np.where(org.level == 3, 0, org.level).astype(np.int16)
+    staff = org.level == 0
+    position_code[staff] = 3 + rng.integers(0, len(COMPANY_ROLES), int(staff.sum()))
+    return OrgData(org.ids, org.level, org.manager_id, position_code,
+                   np.full(len(org), -1, dtype=np.int16), positions, [], has_teams=False)
+
+def support_employees(size: int, seed: int = 0) -> List[Dict]:
+    return generate_synthetic_org(size, seed=seed).to_records()
+
+def _survey_system(size: int) -> EmployeeSurveySystem:
+    system = EmployeeSurveySystem(support_employees(size))
+    system.generate_yearly_survey_data()
+    system.survey_frame
+    return system
+
+# Each setup runs untimed once per size and returns the callable to measure
+
+def _generate_yearly_survey_data(size: int) -> Callable[[], Any]:
+    employees = support_employees(size)
+    return lambda: EmployeeSurveySystem(employees).generate_yearly_survey_data()
+
+def _calculate_descriptive_statistics(size: int) -> Callable[[], Any]:
+    return _survey_system(size).calculate_descriptive_statistics
+
+def _perform_hypothesis_testing(size: int) -> Callable[[], Any]:
+    return _survey_system(size).perform_hypothesis_testing
+
+def _find_chain(size: int) -> Callable[[], Any]:
+    org = company_org(size)
+    rng = np.random.default_rng(0)
+    sample = rng.choice(org.ids, min(CHAIN_SAMPLE, len(org)), replace=False).tolist()
+
+    def run():
+        chains = ReportingChains(org)
+        return [chains.chain(emp_id) for emp_id in sample]
+    return run
+
+def _analyze_team_diversity(size: int) -> Callable[[], Any]:
+    records = company_org(size).to_records()
+    return lambda: OrganizationAnalyzer(records).analyze_team_diversity()
+
+def _build_org_tree(size: int) -> Callable[[], Any]:
+    records = company_org(size).to_records()
+    return lambda: build_org_tree(records)
+
+def _compact_org_tree(size: int) -> Callable[[], Any]:
+    org = company_org(size)
+    return lambda: CompactOrgTree(org)
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    # Larger sizes are skipped unless limits are lifted (survey data is 52 rows per employee)
+    max_size: Optional[int] = None
+
+CASES = [
+    BenchmarkCase('generate_yearly_survey_data', _generate_yearly_survey_data, 100_000),
+    BenchmarkCase('calculate_descriptive_statistics', _calculate_descriptive_statistics, 100_000),
+    BenchmarkCase('perform_hypothesis_testing', _perform_hypothesis_testing, 100_000),
+    BenchmarkCase('find_chain', _find_chain),
+    BenchmarkCase('analyze_team_diversity', _analyze_team_diversity),
+    BenchmarkCase('build_org_tree', _build_org_tree),
+    BenchmarkCase('compact_org_tree', _compact_org_tree),
+]
+
+def measure(run: Callable[[], Any], repeat: int = 1) -> Dict:
+    """Best wall time over `repeat` runs, then peak traced memory of one more run.
+
+    Memory is traced separately so tracemalloc overhead does not skew the timings.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'peak_bytes': peak}
+
+def run_benchmarks(cases: List[BenchmarkCase] = CASES, sizes=SIZES, repeat: Optional[int] = None,
+                   size_limits: bool = True, log: Callable[[str], None] = print) -> Dict[str, Dict]:
+    """Results keyed by ``case@size``."""
+    results = {}
+    for size in sizes:
+        for case in cases:
+            key = f'{case.name}@{size}'
+            if size_limits and case.max_size and size > case.max_size:
+                log(f"{key}: skipped (above {case.max_size:,} employees)")
+                continue
+            run = case.setup(size)
+            runs = repeat or max(1, min(5, 100_000 // size))
+            results[key] = measure(run, runs)
+            log(f"{key}: {results[key]['seconds']:.4f}s, "
+                f"peak {results[key]['peak_bytes'] / 2**20:.1f} MiB")
+    return results
+
+def load_history(path: str = HISTORY_FILE) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)['runs']
+
+def save_history(runs: List[Dict], path: str = HISTORY_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'runs': runs}, f, indent=2)
+    os.replace(tmp_path, path)
+
+def find_regressions(results: Dict[str, Dict], history: List[Dict],
+                     threshold: float = REGRESSION_THRESHOLD) -> List[Dict]:
+    """Compare each result with the latest earlier run that measured the same key."""
+    regressions = []
+    for key, result in results.items():
+        previous = next((run['results'][key] for run in reversed(history) if key in run['results']), None)
+        if previous is None:
+            continue
+        for metric, min_delta in (('seconds', MIN_SECONDS_DELTA), ('peak_bytes', MIN_BYTES_DELTA)):
+            old, new = previous[metric], result[metric]
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append({'benchmark': key, 'metric': metric, 'previous': old,
+                                    'current': new, 'ratio': new / old if old else float('inf')})
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the org and survey analytics.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--cases', nargs='+', choices=[case.name for case in CASES],
+                        help="benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, help="timed runs per benchmark (default: by size)")
+    parser.add_argument('--history', default=HISTORY_FILE)
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown or memory growth flagged as a regression")
+    parser.add_argument('--no-size-limit', action='store_true',
+                        help="also run survey benchmarks above their default size limit")
+    parser.add_argument('--no-record', action='store_true', help="do not append to the history file")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+    results = run_benchmarks(cases, args.sizes, args.repeat, size_limits=not args.no_size_limit)
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, args.threshold)
+    if not args.no_record:
+        history.append({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'results': results,
+        })
+        save_history(history, args.history)
+
+    if regressions:
+        print("\nREGRESSIONS:")
+        for regression in regressions:
+            print(f"{regression['benchmark']} {regression['metric']}: "
+                  f"{regression['previous']:.4g} -> {regression['current']:.4g} "
+                  f"({regression['ratio']:.2f}x)")
+        return 1
+    print("\nNo regressions against the previous run.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import numpy as np
+from typing import Dict, Iterator, List, Optional
+from advanced_analysis import OrganizationAnalyzer, SkillGapMatrix, load_data
+
+try:
+    from sklearn.neighbors import NearestNeighbors
+except ImportError:  # scikit-learn is optional; brute-force scoring is used instead
+    NearestNeighbors = None
+
+class CollaborationMatcher:
+    """Match teams with skill gaps to teams whose spare roles fill them.
+
+    A team's need vector marks the roles it is missing in groups where it
+    has gaps; its surplus vector counts members beyond the first in each
+    role. Candidates are scored by cosine similarity (or plain dot product)
+    of need against surplus over the whole team x role matrix. With many
+    teams, a ball-tree nearest-neighbour index over the normalised surplus
+    vectors is used when scikit-learn is installed.
+    """
+
+    def __init__(self, matrix: SkillGapMatrix, metric: str = 'cosine',
+                 use_index: Optional[bool] = None, index_threshold: int = 5000):
+        if metric not in ('cosine', 'dot'):
+            raise ValueError(f"Unknown similarity metric: {metric}")
+        self.matrix = matrix
+        self.metric = metric
+        self.need = matrix.missing.astype(np.float32)
+        self.surplus = np.maximum(matrix.counts - 1, 0).astype(np.float32)
+
+        if use_index is None:
+            use_index = (metric == 'cosine' and NearestNeighbors is not None and
+                         len(matrix.team_ids) >= index_threshold)
+        if use_index and NearestNeighbors is None:
+            raise ImportError("scikit-learn is required for the nearest-neighbour index")
+        if use_index and metric != 'cosine':
+            raise ValueError("The nearest-neighbour index only supports cosine similarity")
+        self.use_index = use_index
+        self._index = None
+
+    @staticmethod
+    def _normalise(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def _brute_force(self, rows: np.ndarray, k: int):
+        """Top-k candidate rows and scores for a chunk of needy teams."""
+        if self.metric == 'cosine':
+            scores = self._normalise(self.need[rows]) @ self._normalise(self.surplus).T
+        else:
+            scores = self.need[rows] @ self.surplus.T
+        scores[np.arange(len(rows)), rows] = -np.inf
+        k = min(k, scores.shape[1] - 1)
+        if k <= 0:
+            return np.empty((len(rows), 0), dtype=np.int64), np.empty((len(rows), 0))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def _indexed(self, rows: np.ndarray, k: int):
+        """Top-k candidates from the nearest-neighbour index (cosine via unit vectors)."""
+        if self._index is None:
+            self._unit_surplus = self._normalise(self.surplus)
+            self._index = NearestNeighbors(algorithm='ball_tree').fit(self._unit_surplus)
+        queries = self._normalise(self.need[rows])
+        neighbours = min(k + 1, len(self.matrix.team_ids))
+        _, candidates = self._index.kneighbors(queries, n_neighbors=neighbours)
+
+        # Drop each team itself and keep the k best, padding short rows with -1
+        keep = candidates != rows[:, None]
+        rank = np.cumsum(keep, axis=1) - 1
+        keep &= rank < k
+        top = np.full((len(rows), k), -1, dtype=np.int64)
+        top[np.nonzero(keep)[0], rank[keep]] = candidates[keep]
+
+        # Cosine scores; padding gets -inf so it is never reported
+        scores = np.einsum('ij,ikj->ik', queries, self._unit_surplus[np.maximum(top, 0)])
+        return top, np.where(top >= 0, scores, -np.inf)
+
+    def iter_matches(self, k: int = 5, chunk_size: int = 512,
+                     teams: Optional[np.ndarray] = None) -> Iterator[Dict]:
+        """Yield the top-k partner teams for each team with gaps, chunk by chunk.
+
+        Teams come in the order of `SkillGapMatrix.ranked_teams` (the order
+        of `ranked_opportunities`) unless `teams` (matrix rows) is given. Candidates with no useful
+        surplus (score <= 0) are left out.
+        """
+        matrix = self.matrix
+        if teams is None:
+            teams = matrix.ranked_teams()
+        roles = np.array(matrix.roles, dtype=object)
+
+        for start in range(0, len(teams), chunk_size):
+            rows = teams[start:start + chunk_size]
+            if self.use_index:
+                candidates, scores = self._indexed(rows, k)
+            else:
+                candidates, scores = self._brute_force(rows, k)
+
+            for row, team_candidates, team_scores in zip(rows, candidates, scores):
+                gap_roles = matrix.missing[row]
+                matches = []
+                for candidate, score in zip(team_candidates, team_scores):
+                    if score <= 0:
+                        continue
+                    covers = gap_roles & (self.surplus[candidate] > 0)
+                    matches.append({
+                        'team_id': int(matrix.team_ids[candidate]),
+                        'score': float(score),
+                        'covers': roles[covers].tolist(),
+                    })
+                yield {
+                    'team_id': int(matrix.team_ids[row]),
+                    'gap_roles': roles[gap_roles].tolist(),
+                    'matches': matches,
+                }
+
+    def match_all(self, k: int = 5) -> List[Dict]:
+        return list(self.iter_matches(k))
+
+def print_collaboration_matches(analyzer: Optional[OrganizationAnalyzer] = None, k: int = 3, limit: int = 10):
+    if analyzer is None:
+        analyzer = OrganizationAnalyzer(load_data())
+    matcher = CollaborationMatcher(analyzer.skill_gap_matrix())
+
+    print("\n=== COMPLEMENTARY TEAM MATCHES ===\n")
+    for i, result in enumerate(matcher.iter_matches(k)):
+        if i == limit:
+            break
+        print(f"Team {result['team_id']} is missing: {', '.join(result['gap_roles'])}")
+        if not result['matches']:
+            print("  No team has spare people in these roles")
+        for match in result['matches']:
+            print(f"  - Team {match['team_id']} (score {match['score']:.2f}) "
+                  f"can lend: {', '.join(match['covers'])}")
+
+def test_collaboration_matching():
+    """Matches start with the top ranked opportunity on both scoring paths."""
+    try:
+        matrix = OrganizationAnalyzer(load_data()).skill_gap_matrix()
+        first = matrix.ranked_opportunities(1)[0]['team_id']
+        for use_index in (False, NearestNeighbors is not None):
+            result = next(CollaborationMatcher(matrix, use_index=use_index).iter_matches(3))
+            assert result['team_id'] == first, (result['team_id'], first)
+        print(f"✓ Matching starts with team {first}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Error testing collaboration matching: {e!r}")
+        return False
+
+if __name__ == "__main__":
+    print_collaboration_matches()
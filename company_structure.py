@@ -1,7 +1,10 @@
 import random
 import math
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
+import numpy as np
+from json_stream import write_array
+from org_data import OrgData, write_binary
 
 # Specialized support team positions
 SOFTWARE_SUPPORT_ROLES = [
@@ -158,6 +161,117 @@ def create_company_structure(total_employees: int = 500) -> List[Employee]:
     
     return employees
 
+TEAM_ROLES = {
+    "Software": SOFTWARE_SUPPORT_ROLES,
+    "Hardware": HARDWARE_SUPPORT_ROLES,
+    "Maintenance": MAINTENANCE_SUPPORT_ROLES
+}
+
+def _draw_spans(rng: np.random.Generator, count: int, distribution: str, mean: float) -> np.ndarray:
+    """Sample a span of control (at least 1) for each of `count` managers."""
+    if distribution == 'poisson':
+        return 1 + rng.poisson(mean - 1, count)
+    if distribution == 'geometric':
+        return rng.geometric(1 / mean, count)
+    if distribution == 'uniform':
+        return rng.integers(1, int(round(2 * mean)), count, endpoint=False)
+    raise ValueError(f"Unknown span distribution: {distribution}")
+
+def generate_synthetic_org(total_employees: int, depth: int = 2, span_mean: float = 8,
+                           span_distribution: str = 'poisson',
+                           team_mix: Optional[Dict[str, float]] = None,
+                           general_share: float = 0.02, seed: Optional[int] = None) -> OrgData:
+    """Build a support org of any size as parent-index arrays.
+
+    The Director sits at the top; `depth` is the number of reporting steps
+    from the Director down to individual contributors (2 reproduces the
+    Director -> team manager -> staff layout of `create_company_structure`).
+    Manager spans are drawn from `span_distribution` with mean `span_mean`;
+    the remaining headcount is spread over the lowest managers in
+    proportion to spans drawn the same way. Teams are assigned to the
+    Director's direct reports by `team_mix` and inherited downwards.
+    `to_records()` on the result yields `Employee.to_dict` records.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    rng = np.random.default_rng(seed)
+    team_mix = team_mix or {team: 1.0 for team in TEAM_ROLES}
+    teams = list(team_mix)
+    mix = np.array([team_mix[team] for team in teams], dtype=float)
+
+    # Parent of every row, filled one level at a time
+    parents = [np.array([-1])]
+    depths = [np.zeros(1, dtype=np.int64)]
+    count, previous = 1, np.array([0])
+    for level_depth in range(1, depth + 1):
+        budget = total_employees - count
+        if budget <= 0 or not len(previous):
+            break
+        spans = _draw_spans(rng, len(previous), span_distribution, span_mean)
+        if level_depth == depth:
+            spans = rng.multinomial(budget, spans / spans.sum())
+        elif spans.sum() > budget:
+            cut = np.searchsorted(np.cumsum(spans), budget)
+            spans[cut] -= spans[:cut + 1].sum() - budget
+            spans[cut + 1:] = 0
+        rows = np.arange(count, count + spans.sum())
+        parents.append(np.repeat(previous, spans))
+        depths.append(np.full(len(rows), level_depth))
+        count, previous = count + len(rows), rows
+
+    parent = np.concatenate(parents)
+    node_depth = np.concatenate(depths)
+    is_staff = node_depth == depth
+
+    # Teams: sampled for the Director's reports, then inherited
+    team_code = np.zeros(count, dtype=np.int16)
+    first_line = node_depth == 1
+    team_code[first_line] = 1 + rng.choice(len(teams), first_line.sum(), p=mix / mix.sum())
+    for level_depth in range(2, depth + 1):
+        rows = np.flatnonzero(node_depth == level_depth)
+        team_code[rows] = team_code[parent[rows]]
+
+    # Position table: leadership titles, then team roles, then general roles
+    positions = ["Director of Support Services"]
+    positions += [f"{team} Support Manager" for team in teams]
+    positions += [f"{team} Support Lead" for team in teams]
+    role_offset = {}
+    for team in teams:
+        role_offset[team] = len(positions)
+        positions += TEAM_ROLES.get(team, GENERAL_POSITIONS)
+    general_offset = len(positions)
+    positions += GENERAL_POSITIONS
+
+    position_code = np.zeros(count, dtype=np.int16)
+    position_code[first_line] = team_code[first_line]
+    leads = (node_depth >= 2) & ~is_staff
+    position_code[leads] = len(teams) + team_code[leads]
+    staff = np.flatnonzero(is_staff)
+    staff_team = team_code[staff] - 1
+    offsets = np.array([role_offset[team] for team in teams])
+    sizes = np.array([len(TEAM_ROLES.get(team, GENERAL_POSITIONS)) for team in teams])
+    picks = (rng.random(len(staff)) * sizes[staff_team]).astype(np.int64)
+    general = rng.random(len(staff)) < general_share
+    position_code[staff] = np.where(
+        general,
+        general_offset + rng.integers(0, len(GENERAL_POSITIONS), len(staff)),
+        offsets[staff_team] + picks)
+
+    ids = np.arange(1, count + 1, dtype=np.int32)
+    manager_id = np.where(parent >= 0, parent + 1, -1).astype(np.int32)
+    level = np.where(is_staff, 0, depth - node_depth).astype(np.int8)
+    return OrgData(ids, level, manager_id, position_code, team_code,
+                   positions, ["Management"] + teams, has_teams=True)
+
+def save_synthetic_org(org: OrgData, json_path: Optional[str] = None,
+                       binary_path: Optional[str] = None, indent: Optional[int] = 2,
+                       ndjson: Optional[bool] = None):
+    """Write a generated org as support_structure-style JSON and/or binary."""
+    if json_path:
+        write_array(json_path, org.to_records(), indent=indent, ndjson=ndjson)
+    if binary_path:
+        write_binary(org, binary_path, source=json_path)
+
 def generate_team_report(employees: List[Employee]) -> Dict:
     teams = {
         "Software": {"count": 0, "roles": {}},
@@ -175,33 +289,50 @@ def generate_team_report(employees: List[Employee]) -> Dict:
     
     return teams
 
-def main():
+def team_report_from_org(org: OrgData) -> Dict:
+    """`generate_team_report` for an already loaded org structure."""
+    teams = {team: {"count": 0, "roles": {}} for team in TEAM_ROLES}
+    if not org.has_teams or not len(org):
+        return teams
+
+    # Count (team, position) pairs in one pass, keeping first-seen role order
+    pairs = org.team_code.astype(np.int64) * len(org.positions) + org.position_code
+    unique, first_seen, counts = np.unique(pairs, return_index=True, return_counts=True)
+    for i in np.argsort(first_seen):
+        team_code, position_code = divmod(int(unique[i]), len(org.positions))
+        team = org.teams[team_code] if team_code >= 0 else None
+        if team in teams:
+            teams[team]["count"] += int(counts[i])
+            teams[team]["roles"][org.positions[position_code]] = int(counts[i])
+    return teams
+
+def print_team_report(team_report: Dict):
+    for team_type, data in team_report.items():
+        print(f"\n{team_type} Support Team:")
+        print(f"Total members: {data['count']}")
+        print("\nRole distribution:")
+        for role, count in data['roles'].items():
+            print(f"  - {role}: {count} members")
+
+def main(structure_path: str = 'support_structure.json', indent: Optional[int] = 2,
+         ndjson: Optional[bool] = None):
     # Create company structure
     employees = create_company_structure(500)
     
     # Generate team report
     team_report = generate_team_report(employees)
     
-    # Convert all employees to dictionary format
-    employee_data = [emp.to_dict() for emp in employees]
-    
-    # Save data to JSON files
+    # Save data to JSON files, streaming employees in dictionary format
     with open('support_teams.json', 'w') as f:
         json.dump(team_report, f, indent=2)
     
-    with open('support_structure.json', 'w') as f:
-        json.dump(employee_data, f, indent=2)
+    write_array(structure_path, (emp.to_dict() for emp in employees), indent=indent, ndjson=ndjson)
     
     # Print summary
     print("\nSupport Teams Structure Generated!")
     print("=" * 50)
     
-    for team_type, data in team_report.items():
-        print(f"\n{team_type} Support Team:")
-        print(f"Total members: {data['count']}")
-        print("\nRole distribution:")
-        for role, count in data['roles'].items():
-            print(f"  - {role}: {count} members")
+    print_team_report(team_report)
 
 if __name__ == "__main__":
     main()
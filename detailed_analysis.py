@@ -1,8 +1,25 @@
-import json
-from typing import Dict, List, Optional
-from collections import defaultdict
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from org_data import OrgData, load_org
+
+# Role families used in the workforce distribution
+TECHNICAL_ROLES = {'Software Engineer', 'DevOps Engineer', 'Systems Administrator', 'Data Analyst'}
+BUSINESS_ROLES = {'Business Analyst', 'Product Manager', 'Sales Representative', 'Marketing Specialist'}
+
+def role_families(positions: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Technical and business masks over a position table.
+
+    Any title containing "Manager" is left out of both families, as in the
+    company-wide distribution, so subtree and company ratios agree.
+    """
+    managerial = np.array(['Manager' in position for position in positions], dtype=bool)
+    technical = np.array([position in TECHNICAL_ROLES for position in positions], dtype=bool)
+    business = np.array([position in BUSINESS_ROLES for position in positions], dtype=bool)
+    return technical & ~managerial, business & ~managerial
 
 class EmployeeNode:
+    __slots__ = ('id', 'position', 'level', 'subordinates', 'manager')
+
     def __init__(self, id: int, position: str, level: int):
         self.id = id
         self.position = position
@@ -24,74 +41,212 @@ def build_org_tree(employees_data: List[Dict]) -> Dict[int, EmployeeNode]:
     
     return nodes
 
-def print_team_composition(manager_node: EmployeeNode, indent: int = 0):
+class CompactOrgTree:
+    """Array-backed org tree in CSR form.
+
+    Children of row i are ``child_rows[child_offsets[i]:child_offsets[i + 1]]``
+    in org order. Depth and subtree sizes are computed level by level with
+    vectorised NumPy steps, so no per-employee objects are created.
+    """
+
+    def __init__(self, org: OrgData):
+        self.org = org
+        self.parent = org.parent_index
+        count = len(org)
+
+        # Counting sort of rows by parent gives the CSR child lists
+        has_parent = np.flatnonzero(self.parent >= 0)
+        self.span = np.bincount(self.parent[has_parent], minlength=count)
+        self.child_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(self.span, out=self.child_offsets[1:])
+        self.child_rows = has_parent[np.argsort(self.parent[has_parent], kind='stable')]
+
+        # Breadth-first levels from the roots downwards
+        self.depth = np.full(count, -1, dtype=np.int64)
+        self.levels: List[np.ndarray] = []
+        frontier = np.flatnonzero(self.parent < 0)
+        while len(frontier):
+            self.depth[frontier] = len(self.levels)
+            self.levels.append(frontier)
+            frontier = self._children_of(frontier)
+        if (self.depth < 0).any():
+            raise ValueError("Reporting structure contains a cycle")
+
+        # Subtree sizes accumulate bottom-up, one level at a time
+        self.subtree = np.ones(count, dtype=np.int64)
+        for rows in reversed(self.levels[1:]):
+            np.add.at(self.subtree, self.parent[rows], self.subtree[rows])
+
+    def _children_of(self, rows: np.ndarray) -> np.ndarray:
+        """All children of `rows`, concatenated in order."""
+        starts = self.child_offsets[rows]
+        lengths = self.span[rows]
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return self.child_rows[positions]
+
+    def children(self, row: int) -> np.ndarray:
+        return self.child_rows[self.child_offsets[row]:self.child_offsets[row + 1]]
+
+    def row(self, emp_id: int) -> int:
+        index = int(self.org.index_of(emp_id))
+        if index < 0:
+            raise KeyError(f"Unknown employee id {emp_id}")
+        return index
+
+    def subtree_size(self, emp_id: int) -> int:
+        """Headcount of an employee's organisation, including the employee."""
+        return int(self.subtree[self.row(emp_id)])
+
+    def depth_of(self, emp_id: int) -> int:
+        return int(self.depth[self.row(emp_id)])
+
+    def span_of_control(self, emp_id: int) -> int:
+        """Number of direct reports."""
+        return int(self.span[self.row(emp_id)])
+
+    def direct_report_positions(self, row: int) -> List[tuple]:
+        """(position, count) of a manager's direct reports, in first-seen order."""
+        codes = self.org.position_code[self.children(row)]
+        unique, first_seen, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first_seen)
+        return [(self.org.positions[unique[i]], int(counts[i])) for i in order]
+
+class SubtreeAggregates:
+    """Per-manager totals for the whole organisation under each manager.
+
+    One bottom-up pass over the tree levels fills, for every employee with
+    reports, a role histogram of everyone under them (themselves included)
+    and a count of individual contributors, so headcount, role mix and
+    technical/business shares of any subtree are lookups, not traversals.
+    """
+
+    def __init__(self, tree: CompactOrgTree):
+        self.tree = tree
+        org = tree.org
+        positions = org.positions
+        self.managers = np.flatnonzero(tree.span > 0)
+        self.manager_slot = np.full(len(org), -1, dtype=np.int64)
+        self.manager_slot[self.managers] = np.arange(len(self.managers))
+
+        codes = org.position_code.astype(np.int64)
+        self.role_counts = np.zeros((len(self.managers), len(positions)), dtype=np.int32)
+        np.add.at(self.role_counts, (np.arange(len(self.managers)), codes[self.managers]), 1)
+
+        # Leaves (individual contributors) report straight into their manager's totals
+        leaves = np.flatnonzero((tree.span == 0) & (tree.parent >= 0))
+        np.add.at(self.role_counts, (self.manager_slot[tree.parent[leaves]], codes[leaves]), 1)
+        self.contributors = np.bincount(self.manager_slot[tree.parent[leaves]],
+                                        minlength=len(self.managers))
+
+        # Managers fold their totals upwards, deepest level first
+        manager_depths = tree.depth[self.managers]
+        for depth in range(int(manager_depths.max()) if len(self.managers) else 0, 0, -1):
+            rows = self.managers[manager_depths == depth]
+            np.add.at(self.role_counts, self.manager_slot[tree.parent[rows]],
+                      self.role_counts[self.manager_slot[rows]])
+            np.add.at(self.contributors, self.manager_slot[tree.parent[rows]],
+                      self.contributors[self.manager_slot[rows]])
+
+        self.is_technical, self.is_business = role_families(positions)
+        self.headcount = tree.subtree[self.managers]
+        self.technical = self.role_counts[:, self.is_technical].sum(axis=1)
+        self.business = self.role_counts[:, self.is_business].sum(axis=1)
+
+    def org_under(self, emp_id: int) -> Dict:
+        """Headcount and role mix of everyone reporting up to `emp_id`."""
+        row = self.tree.row(emp_id)
+        slot = self.manager_slot[row]
+        positions = self.tree.org.positions
+        if slot < 0:
+            code = self.tree.org.position_code[row]
+            return {'headcount': 1, 'individual_contributors': 1, 'role_counts': {positions[code]: 1},
+                    'technical_ratio': float(self.is_technical[code]),
+                    'business_ratio': float(self.is_business[code])}
+
+        counts = self.role_counts[slot]
+        contributors = max(int(self.contributors[slot]), 1)
+        return {
+            'headcount': int(self.headcount[slot]),
+            'individual_contributors': int(self.contributors[slot]),
+            'role_counts': {positions[i]: int(counts[i]) for i in np.flatnonzero(counts)},
+            'technical_ratio': float(self.technical[slot]) / contributors,
+            'business_ratio': float(self.business[slot]) / contributors,
+        }
+
+def print_team_composition(tree: CompactOrgTree, manager_row: int, indent: int = 0):
     prefix = "  " * indent
-    print(f"{prefix}📊 {manager_node.position} (ID: {manager_node.id})")
+    position = tree.org.positions[tree.org.position_code[manager_row]]
+    print(f"{prefix}📊 {position} (ID: {tree.org.ids[manager_row]})")
     
-    # Group subordinates by position
-    positions = defaultdict(list)
-    for sub in manager_node.subordinates:
-        positions[sub.position].append(sub)
-    
-    # Print team composition
-    for position, employees in positions.items():
+    # Print team composition, grouped by position
+    for position, count in tree.direct_report_positions(manager_row):
         if "Manager" not in position:
-            print(f"{prefix}  └─ {position}: {len(employees)} employee(s)")
+            print(f"{prefix}  └─ {position}: {count} employee(s)")
 
-def analyze_detailed_structure():
+def analyze_detailed_structure(org: Optional[OrgData] = None, tree: Optional[CompactOrgTree] = None,
+                               aggregates: Optional[SubtreeAggregates] = None):
     # Load the company structure data
-    with open('company_structure.json', 'r') as f:
-        employees_data = json.load(f)
+    if tree is not None:
+        org = tree.org
+    elif org is None:
+        org = load_org('company_structure.json')
     
     # Build organization tree
-    nodes = build_org_tree(employees_data)
+    if tree is None:
+        tree = CompactOrgTree(org)
+    positions = org.positions
+    
+    if aggregates is None:
+        aggregates = SubtreeAggregates(tree)
     
     # Find top-level managers (Level 2)
-    top_managers = [node for node in nodes.values() if node.level == 2]
+    top_managers = np.flatnonzero(org.level == 2)
     
     print("\n=== DETAILED ORGANIZATIONAL HIERARCHY ===\n")
     
     # Analyze each top-level manager's organization
     for top_manager in top_managers:
+        title = positions[org.position_code[top_manager]]
+        summary = aggregates.org_under(int(org.ids[top_manager]))
         print("\n" + "="*50)
-        print(f"\nORGANIZATION UNDER {top_manager.position} (ID: {top_manager.id})")
+        print(f"\nORGANIZATION UNDER {title} (ID: {org.ids[top_manager]})")
         print("="*50)
+        print(f"\nHeadcount: {summary['headcount']} "
+              f"(Technical {summary['technical_ratio']:.1%}, Business {summary['business_ratio']:.1%})")
         
         # Print direct reports (Level 1 managers)
-        print(f"\nDirect Reports ({len(top_manager.subordinates)} Level 1 Managers):")
-        for i, manager in enumerate(top_manager.subordinates, 1):
+        print(f"\nDirect Reports ({tree.span[top_manager]} Level 1 Managers):")
+        for i, manager in enumerate(tree.children(top_manager), 1):
             print(f"\n🔹 TEAM {i}")
-            print_team_composition(manager, indent=1)
+            print_team_composition(tree, manager, indent=1)
     
-    # Calculate some interesting statistics
-    technical_roles = {'Software Engineer', 'DevOps Engineer', 'Systems Administrator', 'Data Analyst'}
-    business_roles = {'Business Analyst', 'Product Manager', 'Sales Representative', 'Marketing Specialist'}
-    
-    role_counts = defaultdict(int)
-    tech_count = 0
-    business_count = 0
-    
-    for emp in employees_data:
-        if 'Manager' not in emp['position']:
-            role_counts[emp['position']] += 1
-            if emp['position'] in technical_roles:
-                tech_count += 1
-            elif emp['position'] in business_roles:
-                business_count += 1
+    # Calculate some interesting statistics over the whole company
+    role_counts = np.bincount(org.position_code, minlength=len(positions))
+    is_manager = np.array(['Manager' in position for position in positions], dtype=bool)
+    role_counts[is_manager] = 0
+    # Percentages are shares of all individual contributors (employees without reports)
+    contributors = int((tree.span == 0).sum())
+    total = max(contributors, 1)
+    tech_count = int(role_counts[aggregates.is_technical].sum())
+    business_count = int(role_counts[aggregates.is_business].sum())
+    other_count = contributors - tech_count - business_count
     
     print("\n" + "="*50)
     print("\nWORKFORCE DISTRIBUTION ANALYSIS")
     print("="*50)
     
     print("\nTechnical vs Business Ratio:")
-    print(f"Technical Roles: {tech_count} employees ({tech_count/5:.1f}%)")
-    print(f"Business Roles: {business_count} employees ({business_count/5:.1f}%)")
-    print(f"Other Roles: {500-tech_count-business_count} employees ({(500-tech_count-business_count)/5:.1f}%)")
+    print(f"Technical Roles: {tech_count} employees ({tech_count/total*100:.1f}%)")
+    print(f"Business Roles: {business_count} employees ({business_count/total*100:.1f}%)")
+    print(f"Other Roles: {other_count} employees ({other_count/total*100:.1f}%)")
     
     print("\nTop 5 Largest Departments:")
-    top_roles = sorted(role_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_roles = sorted(((positions[i], int(count)) for i, count in enumerate(role_counts) if count),
+                       key=lambda x: x[1], reverse=True)[:5]
     for role, count in top_roles:
-        print(f"- {role}: {count} employees ({count/5:.1f}%)")
+        print(f"- {role}: {count} employees ({count/total*100:.1f}%)")
 
 if __name__ == "__main__":
     analyze_detailed_structure()
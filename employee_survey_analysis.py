@@ -1,18 +1,31 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-import json
 from scipy import stats
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import random
+from json_stream import write_object
+from org_data import OrgData, load_org
+from survey_rendering import precompute_aggregates, render_figures
+from survey_store import METRICS, PartitionedSurveyStore, SurveyColumnStore
+from survey_stats import (
+    DEFAULT_RESAMPLES, GroupKey, SurveyAccumulator, grouped_descriptive_statistics,
+    pairwise_resampling_tests, pairwise_t_tests, rating_histograms
+)
+from turnover_risk import compute_risk_features, top_at_risk
+
+# Per-employee baseline (mean, std) and weekly noise std for each metric
+BASELINE_PARAMS = np.array([[3.5, 0.5], [3.8, 0.4], [3.7, 0.3]])
+WEEKLY_NOISE = np.array([0.3, 0.2, 0.25])
+SEASONAL_AMPLITUDE = 0.3
 
 class EmployeeSurveySystem:
-    def __init__(self):
-        # Load employee structure
-        with open('support_structure.json', 'r') as f:
-            self.employees = json.load(f)
+    def __init__(self, employees: Optional[List[Dict]] = None):
+        # Load employee structure unless one is supplied
+        if employees is None:
+            self.org = load_org('support_structure.json')
+        else:
+            self.org = OrgData.from_records(employees)
         
         self.questions = [
             "How was your day? (1-5)",
@@ -20,155 +33,216 @@ class EmployeeSurveySystem:
             "Are you happy with your work? (1-5)"
         ]
         
-        # Initialize survey data structure
-        self.survey_data = {
-            'employee_id': [],
-            'team_type': [],
-            'date': [],
-            'day_rating': [],
-            'accomplishment_rating': [],
-            'happiness_rating': []
-        }
+        # Columnar store for survey responses
+        self.survey_data = SurveyColumnStore()
+
+        # Running statistics, updated as batches are ingested
+        self.accumulator = SurveyAccumulator()
+
+    @property
+    def employees(self) -> List[Dict]:
+        """Employee records in the support_structure.json layout"""
+        return self.org.to_records()
+
+    @property
+    def survey_frame(self) -> pd.DataFrame:
+        """Survey responses as a DataFrame, rebuilt only when the data changes"""
+        return self.survey_data.to_frame()
 
     def generate_yearly_survey_data(self):
         """Generate synthetic survey data for one year"""
-        start_date = datetime(2024, 1, 1)
-        
-        # Generate weekly responses for each employee
-        for employee in self.employees:
-            # Skip the director
-            if employee['position'] == "Director of Support Services":
-                continue
-            
-            # Employee's base satisfaction levels (different for each employee)
-            base_day_rating = np.random.normal(3.5, 0.5)
-            base_accomplishment = np.random.normal(3.8, 0.4)
-            base_happiness = np.random.normal(3.7, 0.3)
-            
-            # Generate 52 weeks of data
-            for week in range(52):
-                current_date = start_date + timedelta(weeks=week)
-                
-                # Add some random variation and seasonal effects
-                seasonal_effect = np.sin(week * 2 * np.pi / 52) * 0.3
-                
-                # Generate ratings with some randomness and seasonal effects
-                day_rating = max(1, min(5, base_day_rating + seasonal_effect + np.random.normal(0, 0.3)))
-                accomplishment = max(1, min(5, base_accomplishment + seasonal_effect + np.random.normal(0, 0.2)))
-                happiness = max(1, min(5, base_happiness + seasonal_effect + np.random.normal(0, 0.25)))
-                
-                # Store the data
-                self.survey_data['employee_id'].append(employee['id'])
-                self.survey_data['team_type'].append(employee['team_type'])
-                self.survey_data['date'].append(current_date)
-                self.survey_data['day_rating'].append(round(day_rating))
-                self.survey_data['accomplishment_rating'].append(round(accomplishment))
-                self.survey_data['happiness_rating'].append(round(happiness))
+        self.ingest_batch(self.generate_survey_frame(datetime(2024, 1, 1), 52))
+
+    def ingest_batch(self, batch: pd.DataFrame, keep_rows: bool = True):
+        """Add a batch of responses and update the running statistics
+
+        With ``keep_rows=False`` only the accumulator is updated, which is
+        enough for `incremental_statistics`.
+        """
+        if keep_rows:
+            self.survey_data.append(batch)
+        self.accumulator.ingest(batch)
+
+    def load_partitions(self, store: PartitionedSurveyStore, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None, teams: Optional[List[str]] = None):
+        """Replace the in-memory responses with those read from a partitioned store
+
+        Only partitions overlapping the date range and teams are read.
+        """
+        self.survey_data.clear()
+        self.accumulator = SurveyAccumulator()
+        self.ingest_batch(store.read(start, end, teams))
+
+    def save_partitions(self, store: PartitionedSurveyStore):
+        """Write the in-memory responses to a partitioned store"""
+        store.write(self.survey_frame)
+
+    def save_accumulator(self, path: str):
+        """Persist the running statistics so a later run can resume"""
+        self.accumulator.save(path)
+
+    def load_accumulator(self, path: str):
+        """Resume running statistics saved by `save_accumulator`"""
+        self.accumulator = SurveyAccumulator.load(path)
+
+    def generate_survey_frame(self, start_date: datetime = datetime(2024, 1, 1),
+                              num_periods: int = 52,
+                              cadence: Union[str, timedelta] = '7D',
+                              seed: Optional[int] = None) -> pd.DataFrame:
+        """Generate synthetic survey data for every employee in one batch.
+
+        Builds the whole (employee x period x metric) rating tensor with a
+        handful of NumPy calls and returns it as a columnar DataFrame with
+        one row per employee and survey date.
+        """
+        rng = np.random.default_rng(seed)
+        respondents = self.org.position_names() != "Director of Support Services"
+        employee_ids = self.org.ids[respondents].astype(np.int32)
+        teams, team_codes = np.unique(
+            np.array(self.org.teams)[self.org.team_code[respondents]], return_inverse=True)
+        dates = pd.date_range(start_date, periods=num_periods, freq=cadence)
+
+        # Seasonal effect completes one cycle every 52 weeks
+        elapsed_days = (dates - dates[0]).days.to_numpy()
+        seasonal = np.sin(elapsed_days * 2 * np.pi / 364) * SEASONAL_AMPLITUDE
+
+        num_employees = len(employee_ids)
+        base = rng.normal(BASELINE_PARAMS[:, 0], BASELINE_PARAMS[:, 1],
+                          size=(num_employees, len(METRICS))).astype(np.float32)
+        noise = rng.standard_normal((num_employees, num_periods, len(METRICS)),
+                                    dtype=np.float32)
+        noise *= WEEKLY_NOISE.astype(np.float32)
+        noise += base[:, None, :]
+        noise += seasonal.astype(np.float32)[None, :, None]
+        ratings = np.rint(np.clip(noise, 1, 5, out=noise), out=noise).astype(np.int8)
+        ratings = ratings.reshape(-1, len(METRICS))
+
+        frame = pd.DataFrame({
+            'employee_id': np.repeat(employee_ids, num_periods),
+            'team_type': pd.Categorical.from_codes(
+                np.repeat(team_codes.astype(np.int8), num_periods), categories=teams),
+            'date': np.tile(dates.to_numpy(), num_employees),
+        })
+        for i, metric in enumerate(METRICS):
+            frame[metric] = ratings[:, i]
+        return frame
 
     def calculate_descriptive_statistics(self) -> Dict:
         """Calculate descriptive statistics for survey responses"""
-        df = pd.DataFrame(self.survey_data)
-        
+        summary = grouped_descriptive_statistics(self.survey_frame, by=['team_type'])
+        return self._statistics_by_team(summary)
+
+    def incremental_statistics(self) -> Dict:
+        """Descriptive statistics from the running accumulator, without a rescan"""
+        return self._statistics_by_team(self.accumulator.summary())
+
+    @staticmethod
+    def _statistics_by_team(summary: pd.DataFrame) -> Dict:
+        """Convert a grouped statistics frame into the nested per-team report"""
         stats_by_team = {}
-        for team in ['Software', 'Hardware', 'Maintenance']:
-            team_data = df[df['team_type'] == team]
-            
+        for team, row in summary.iterrows():
             stats_by_team[team] = {
-                'day_rating': {
-                    'mean': team_data['day_rating'].mean(),
-                    'median': team_data['day_rating'].median(),
-                    'mode': team_data['day_rating'].mode().iloc[0],
-                    'std': team_data['day_rating'].std()
-                },
-                'accomplishment_rating': {
-                    'mean': team_data['accomplishment_rating'].mean(),
-                    'median': team_data['accomplishment_rating'].median(),
-                    'mode': team_data['accomplishment_rating'].mode().iloc[0],
-                    'std': team_data['accomplishment_rating'].std()
-                },
-                'happiness_rating': {
-                    'mean': team_data['happiness_rating'].mean(),
-                    'median': team_data['happiness_rating'].median(),
-                    'mode': team_data['happiness_rating'].mode().iloc[0],
-                    'std': team_data['happiness_rating'].std()
+                metric: {
+                    'mean': float(row[(metric, 'mean')]),
+                    'median': float(row[(metric, 'median')]),
+                    'mode': int(row[(metric, 'mode')]),
+                    'std': float(row[(metric, 'std')])
                 }
+                for metric in METRICS
             }
-        
+
         return stats_by_team
 
-    def perform_hypothesis_testing(self) -> Dict:
-        """Perform hypothesis testing between teams"""
-        df = pd.DataFrame(self.survey_data)
-        
+    def grouped_statistics(self, by: List[GroupKey]) -> pd.DataFrame:
+        """Descriptive statistics for arbitrary groupings, e.g. team x month"""
+        return grouped_descriptive_statistics(self.survey_frame, by=by)
+
+    def perform_hypothesis_testing(self, use_summaries: bool = True, equal_var: bool = True,
+                                   resampling: Optional[str] = None, n_resamples: int = DEFAULT_RESAMPLES,
+                                   seed: Optional[int] = None) -> Dict:
+        """Perform hypothesis testing between teams
+
+        By default every pairwise t-test is derived from per-team summaries
+        computed in one pass. Pass ``resampling='permutation'`` or
+        ``'bootstrap'`` to add a resampling-based p-value per pair.
+        """
+        df = self.survey_frame
+        if not use_summaries:
+            return self._hypothesis_tests_from_rows(df, equal_var)
+
+        index, hist = rating_histograms(df, by=['team_type'])
+        t_tests = pairwise_t_tests(index, hist, equal_var=equal_var)
+        resampled = None
+        if resampling:
+            resampled = pairwise_resampling_tests(index, hist, method=resampling,
+                                                  n_resamples=n_resamples, seed=seed)
+
+        test_results = {metric: {} for metric in METRICS}
+        for (metric, team1, team2), row in t_tests.iterrows():
+            result = {
+                't_statistic': float(row['t_statistic']),
+                'p_value': float(row['p_value'])
+            }
+            if resampled is not None:
+                extra = resampled.loc[(metric, team1, team2)]
+                result[f'{resampling}_p_value'] = float(extra['p_value'])
+                if resampling == 'bootstrap':
+                    result['bootstrap_ci'] = [float(extra['ci_low']), float(extra['ci_high'])]
+            test_results[metric][f'{team1}_vs_{team2}'] = result
+
+        return test_results
+
+    def _hypothesis_tests_from_rows(self, df: pd.DataFrame, equal_var: bool) -> Dict:
+        """Pairwise t-tests computed directly from the raw responses"""
         test_results = {}
-        metrics = ['day_rating', 'accomplishment_rating', 'happiness_rating']
-        teams = ['Software', 'Hardware', 'Maintenance']
-        
-        for metric in metrics:
+        teams = sorted(df['team_type'].unique())
+
+        for metric in METRICS:
             test_results[metric] = {}
             for team1 in teams:
                 for team2 in teams:
                     if team1 < team2:
                         t_stat, p_value = stats.ttest_ind(
                             df[df['team_type'] == team1][metric],
-                            df[df['team_type'] == team2][metric]
+                            df[df['team_type'] == team2][metric],
+                            equal_var=equal_var
                         )
                         test_results[metric][f'{team1}_vs_{team2}'] = {
-                            't_statistic': t_stat,
-                            'p_value': p_value
+                            't_statistic': float(t_stat),
+                            'p_value': float(p_value)
                         }
-        
+
         return test_results
 
-    def generate_visualizations(self):
-        """Generate various visualizations of the survey data"""
-        df = pd.DataFrame(self.survey_data)
-        
-        # Set up the plotting style
-        plt.style.use('seaborn')
-        
-        # 1. Time series plot of average ratings by team
-        plt.figure(figsize=(15, 8))
-        for team in ['Software', 'Hardware', 'Maintenance']:
-            team_data = df[df['team_type'] == team].groupby('date')['happiness_rating'].mean()
-            plt.plot(team_data.index, team_data.values, label=team, linewidth=2)
-        
-        plt.title('Average Happiness Rating Over Time by Team')
-        plt.xlabel('Date')
-        plt.ylabel('Average Happiness Rating')
-        plt.legend()
-        plt.savefig('happiness_over_time.png')
-        plt.close()
-        
-        # 2. Box plots for all metrics by team
-        plt.figure(figsize=(15, 8))
-        metrics = ['day_rating', 'accomplishment_rating', 'happiness_rating']
-        
-        for i, metric in enumerate(metrics, 1):
-            plt.subplot(1, 3, i)
-            sns.boxplot(data=df, x='team_type', y=metric)
-            plt.title(f'{metric.replace("_", " ").title()}')
-            plt.xticks(rotation=45)
-        
-        plt.tight_layout()
-        plt.savefig('ratings_distribution.png')
-        plt.close()
-        
-        # 3. Correlation heatmap
-        plt.figure(figsize=(10, 8))
-        correlation_matrix = df[['day_rating', 'accomplishment_rating', 'happiness_rating']].corr()
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', vmin=-1, vmax=1)
-        plt.title('Correlation between Survey Metrics')
-        plt.savefig('correlation_heatmap.png')
-        plt.close()
-
-def main():
+    def rank_turnover_risk(self, k: int = 20, window: int = 8) -> pd.DataFrame:
+        """Employees most at risk of leaving, from their recent survey trends"""
+        return top_at_risk(compute_risk_features(self.survey_frame, window=window), k)
+
+    def generate_visualizations(self, output_dir: str = '.', per_team: bool = False,
+                                workers: Optional[int] = None) -> Dict[str, List[str]]:
+        """Generate various visualizations of the survey data
+
+        Aggregates are computed once, then figures are rendered headlessly
+        in a process pool. Figures whose aggregates have not changed since
+        the last run are left as they are.
+        """
+        specs = precompute_aggregates(self.survey_frame, per_team=per_team)
+        return render_figures(specs, output_dir=output_dir, workers=workers)
+
+def main(data_dir: str = 'survey_partitions'):
     # Initialize the survey system
     survey_system = EmployeeSurveySystem()
+    store = PartitionedSurveyStore(data_dir)
     
-    # Generate synthetic survey data
-    print("Generating yearly survey data...")
-    survey_system.generate_yearly_survey_data()
+    if len(store):
+        # Reuse responses already on disk
+        print(f"Loading survey data from {data_dir}...")
+        survey_system.load_partitions(store, start=datetime(2024, 1, 1), end=datetime(2024, 12, 31))
+    else:
+        # Generate synthetic survey data
+        print("Generating yearly survey data...")
+        survey_system.generate_yearly_survey_data()
+        survey_system.save_partitions(store)
     
     # Calculate descriptive statistics
     print("\nCalculating descriptive statistics...")
@@ -182,14 +256,11 @@ def main():
     print("\nGenerating visualizations...")
     survey_system.generate_visualizations()
     
-    # Save results
-    results = {
-        'descriptive_statistics': stats,
-        'hypothesis_testing': hypothesis_results
-    }
-    
-    with open('survey_analysis_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    # Save results, one section at a time
+    write_object('survey_analysis_results.json', [
+        ('descriptive_statistics', stats),
+        ('hypothesis_testing', hypothesis_results)
+    ])
     
     # Print summary statistics
     print("\nSummary Statistics by Team:")
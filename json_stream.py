@@ -0,0 +1,141 @@
+import os
+import json
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Tuple
+
+# File extensions treated as newline-delimited JSON when writing by path
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+READ_CHUNK_SIZE = 1 << 16
+
+def is_ndjson_path(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in NDJSON_EXTENSIONS
+
+def _encode(value: Any, indent: Optional[int], depth: int) -> str:
+    """`json.dumps` output for a value nested `depth` levels into the document."""
+    if indent is None:
+        return json.dumps(value, separators=(',', ':'))
+    # JSON strings never hold raw newlines, so re-indenting line by line is safe
+    return json.dumps(value, indent=indent).replace('\n', '\n' + ' ' * (indent * depth))
+
+def dump_array(items: Iterable[Any], f: IO[str], indent: Optional[int] = 2,
+               ndjson: bool = False) -> int:
+    """Write `items` as a JSON array one element at a time; returns the count.
+
+    With an `indent` the output matches ``json.dump(list(items), f, indent=indent)``;
+    ``indent=None`` writes a compact array and ``ndjson=True`` writes one compact
+    document per line. Only one element is held in memory at a time.
+    """
+    count = 0
+    if ndjson:
+        for item in items:
+            f.write(_encode(item, None, 0))
+            f.write('\n')
+            count += 1
+        return count
+
+    separator = ',' if indent is None else ',\n' + ' ' * indent
+    for item in items:
+        if count == 0:
+            f.write('[' if indent is None else '[\n' + ' ' * indent)
+        else:
+            f.write(separator)
+        f.write(_encode(item, indent, 1))
+        count += 1
+    if count == 0:
+        f.write('[]')
+    else:
+        f.write(']' if indent is None else '\n]')
+    return count
+
+def dump_object(pairs: Iterable[Tuple[str, Any]], f: IO[str], indent: Optional[int] = 2):
+    """Write (key, value) pairs as a JSON object one entry at a time."""
+    first = True
+    for key, value in pairs:
+        if first:
+            f.write('{' if indent is None else '{\n' + ' ' * indent)
+            first = False
+        else:
+            f.write(',' if indent is None else ',\n' + ' ' * indent)
+        f.write(json.dumps(key))
+        f.write(':' if indent is None else ': ')
+        f.write(_encode(value, indent, 1))
+    if first:
+        f.write('{}')
+    else:
+        f.write('}' if indent is None else '\n}')
+
+def write_array(path: str, items: Iterable[Any], indent: Optional[int] = 2,
+                ndjson: Optional[bool] = None) -> int:
+    """Stream `items` to `path`; NDJSON by default for .ndjson/.jsonl paths."""
+    if ndjson is None:
+        ndjson = is_ndjson_path(path)
+    with open(path, 'w') as f:
+        return dump_array(items, f, indent=indent, ndjson=ndjson)
+
+def write_object(path: str, pairs: Iterable[Tuple[str, Any]], indent: Optional[int] = 2):
+    with open(path, 'w') as f:
+        dump_object(pairs, f, indent=indent)
+
+def _iter_ndjson(f: IO[str]) -> Iterator[Any]:
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+def _iter_array(f: IO[str], buffer: str) -> Iterator[Any]:
+    """Decode the elements of a JSON array incrementally from `f`."""
+    decoder = json.JSONDecoder()
+    pos = buffer.index('[') + 1
+    eof = False
+    while True:
+        # Skip whitespace and separators, reading more input as needed
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(READ_CHUNK_SIZE), 0
+            eof = not buffer
+        if pos >= len(buffer):
+            raise ValueError("Unterminated JSON array")
+        if buffer[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # The element may continue in the next chunk
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """Yield the records of a JSON array or NDJSON file one at a time.
+
+    The format is detected from the first character, so either layout may
+    use any file extension.
+    """
+    with open(path, 'r') as f:
+        buffer = f.read(READ_CHUNK_SIZE)
+        while buffer and not buffer.strip():
+            buffer = f.read(READ_CHUNK_SIZE)
+        if buffer.lstrip().startswith('['):
+            yield from _iter_array(f, buffer)
+        else:
+            yield from _iter_ndjson(_chain_lines(buffer, f))
+
+def _chain_lines(buffer: str, f: IO[str]) -> Iterator[str]:
+    """Lines of `f`, with `buffer` (already read from it) in front."""
+    head = buffer.split('\n')
+    tail = head.pop()
+    yield from head
+    rest = f.readline()
+    yield tail + rest
+    yield from f
@@ -0,0 +1,126 @@
+import sys
+import time
+import argparse
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, TextIO
+from advanced_analysis import OrganizationAnalyzer, print_advanced_analysis
+from analyze_structure import ReportingChains, analyze_company_structure
+from collaboration_matching import print_collaboration_matches
+from company_structure import print_team_report, team_report_from_org
+from detailed_analysis import CompactOrgTree, SubtreeAggregates, analyze_detailed_structure
+from org_data import OrgData, load_org
+
+class OrgContext:
+    """An org structure loaded once, with every derived index built on first use.
+
+    The id map lives on the shared `OrgData`; the reporting chains, CSR tree
+    (manager -> members), subtree aggregates, employee records and skill
+    group analyzer are each built at most once and reused by every report.
+    """
+
+    def __init__(self, json_path: str = 'company_structure.json', org: Optional[OrgData] = None):
+        self.json_path = json_path
+        self.org = org if org is not None else load_org(json_path)
+
+    @cached_property
+    def chains(self) -> ReportingChains:
+        return ReportingChains(self.org)
+
+    @cached_property
+    def tree(self) -> CompactOrgTree:
+        return CompactOrgTree(self.org)
+
+    @cached_property
+    def aggregates(self) -> SubtreeAggregates:
+        return SubtreeAggregates(self.tree)
+
+    @cached_property
+    def records(self) -> List[Dict]:
+        return self.org.to_records()
+
+    @cached_property
+    def analyzer(self) -> OrganizationAnalyzer:
+        return OrganizationAnalyzer(self.records)
+
+def _team_report(context: OrgContext):
+    print("\nSupport Teams Structure:")
+    print("=" * 50)
+    if not context.org.has_teams:
+        print(f"\nTeam data unavailable: {context.json_path} has no team_type field")
+        return
+    print_team_report(team_report_from_org(context.org))
+
+# Report name -> runner; all share the indexes on the context
+REPORTS: Dict[str, Callable[[OrgContext], None]] = {
+    'structure': lambda context: analyze_company_structure(context.org, chains=context.chains),
+    'detailed': lambda context: analyze_detailed_structure(tree=context.tree, aggregates=context.aggregates),
+    'advanced': lambda context: print_advanced_analysis(context.analyzer),
+    'collaboration': lambda context: print_collaboration_matches(context.analyzer),
+    'teams': _team_report,
+}
+
+def run_reports(context: OrgContext, names: List[str], timings: bool = False):
+    for name in names:
+        start = time.perf_counter()
+        REPORTS[name](context)
+        if timings:
+            print(f"[{name}: {time.perf_counter() - start:.3f}s]", file=sys.stderr)
+
+def serve(context: OrgContext, stream: TextIO = sys.stdin, timings: bool = False) -> OrgContext:
+    """Answer report requests read line by line until EOF or `quit`.
+
+    Each line names one or more reports (or `all`); `reload` re-reads the
+    org file and drops every cached index.
+    """
+    for line in stream:
+        names = line.split()
+        if not names:
+            continue
+        if names[0] == 'quit':
+            break
+        if names[0] == 'reload':
+            context = OrgContext(context.json_path)
+            print(f"Reloaded {len(context.org)} employees from {context.json_path}")
+        else:
+            names = list(REPORTS) if names == ['all'] else names
+            unknown = [name for name in names if name not in REPORTS]
+            if unknown:
+                print(f"Unknown report(s): {', '.join(unknown)} "
+                      f"(choose from {', '.join(REPORTS)})")
+            else:
+                try:
+                    run_reports(context, names, timings)
+                except Exception as e:
+                    # Keep serving; one failing report should not drop the loaded state
+                    print(f"Report failed: {e!r}")
+        sys.stdout.flush()
+    return context
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run org structure reports from a single load.")
+    parser.add_argument('reports', nargs='*', default=['all'],
+                        help=f"reports to run: {', '.join(REPORTS)} or all (default: all)")
+    parser.add_argument('--data', default='company_structure.json',
+                        help="org structure file (JSON array or NDJSON)")
+    parser.add_argument('--serve', action='store_true',
+                        help="keep the org loaded and read report names from stdin")
+    parser.add_argument('--timings', action='store_true',
+                        help="print load and per-report times to stderr")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.reports if name not in REPORTS and name != 'all']
+    if unknown:
+        parser.error(f"unknown report(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    context = OrgContext(args.data)
+    if args.timings:
+        print(f"[load: {time.perf_counter() - start:.3f}s]", file=sys.stderr)
+
+    if args.serve:
+        serve(context, timings=args.timings)
+    else:
+        names = list(REPORTS) if 'all' in args.reports else args.reports
+        run_reports(context, names, args.timings)
+
+if __name__ == "__main__":
+    main()
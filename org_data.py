@@ -0,0 +1,255 @@
+import os
+import json
+import mmap
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from json_stream import iter_records
+
+# Binary org files start with this tag followed by a little-endian header length
+MAGIC = b'ORGBIN01'
+BINARY_EXTENSION = '.orgbin'
+ALIGNMENT = 64
+
+# manager_id value for employees without a manager
+NO_MANAGER = -1
+
+# Array columns stored in the binary format and their dtypes
+ARRAY_DTYPES = {
+    'ids': np.int32,
+    'level': np.int8,
+    'manager_id': np.int32,
+    'position_code': np.int16,
+    'team_code': np.int16,
+}
+
+class OrgData:
+    """Struct-of-arrays view of an org structure file.
+
+    Holds one array per field (id, level, manager id, position code, team
+    code) plus the string tables the codes index into. Arrays may be backed
+    by a memory-mapped binary file, in which case they are read-only.
+    """
+
+    def __init__(self, ids: np.ndarray, level: np.ndarray, manager_id: np.ndarray,
+                 position_code: np.ndarray, team_code: np.ndarray,
+                 positions: List[str], teams: List[str], has_teams: bool = True):
+        self.ids = ids
+        self.level = level
+        self.manager_id = manager_id
+        self.position_code = position_code
+        self.team_code = team_code
+        self.positions = positions
+        self.teams = teams
+        self.has_teams = has_teams
+        self._lookup = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'OrgData':
+        """Build the arrays from employee dicts as stored in the JSON files.
+
+        `records` may be any iterable, e.g. a stream from `iter_records`;
+        each record is only visited once.
+        """
+        positions: Dict[str, int] = {}
+        teams: Dict[str, int] = {}
+        ids, level, manager_id, position_code, team_code = [], [], [], [], []
+        has_teams = None
+
+        for emp in records:
+            if has_teams is None:
+                has_teams = 'team_type' in emp
+            ids.append(emp['id'])
+            level.append(emp.get('level', 0))
+            manager = emp.get('manager_id')
+            manager_id.append(NO_MANAGER if manager is None else manager)
+            position_code.append(positions.setdefault(emp['position'], len(positions)))
+            team = emp.get('team_type')
+            team_code.append(-1 if team is None else teams.setdefault(team, len(teams)))
+
+        columns = {name: np.array(values, dtype=ARRAY_DTYPES[name]) for name, values in
+                   zip(ARRAY_DTYPES, (ids, level, manager_id, position_code, team_code))}
+        return cls(positions=list(positions), teams=list(teams),
+                   has_teams=bool(has_teams), **columns)
+
+    def index_of(self, ids) -> np.ndarray:
+        """Row index of each employee id (-1 for unknown ids)."""
+        ids = np.asarray(ids)
+        if self._lookup is None:
+            max_id = int(self.ids.max()) if len(self.ids) else 0
+            if len(self.ids) and self.ids.min() >= 0 and max_id < 4 * len(self.ids) + 1024:
+                lookup = np.full(max_id + 1, -1, dtype=np.int64)
+                lookup[self.ids] = np.arange(len(self.ids))
+                self._lookup = ('dense', lookup)
+            else:
+                order = np.argsort(self.ids, kind='stable')
+                self._lookup = ('sorted', (self.ids[order], order))
+
+        kind, table = self._lookup
+        if kind == 'dense':
+            inside = (ids >= 0) & (ids < len(table))
+            return np.where(inside, table[np.clip(ids, 0, len(table) - 1)], -1)
+        sorted_ids, order = table
+        if len(sorted_ids) == 0:
+            return np.full(ids.shape, -1, dtype=np.int64)
+        pos = np.clip(np.searchsorted(sorted_ids, ids), 0, len(sorted_ids) - 1)
+        return np.where(sorted_ids[pos] == ids, order[pos], -1)
+
+    @property
+    def parent_index(self) -> np.ndarray:
+        """Row index of each employee's manager (-1 for the top of the org)."""
+        parents = self.index_of(self.manager_id)
+        parents[self.manager_id == NO_MANAGER] = -1
+        return parents
+
+    def position_names(self) -> np.ndarray:
+        """Position title of every employee as a string array."""
+        return np.array(self.positions, dtype=object)[self.position_code]
+
+    def to_records(self) -> List[Dict]:
+        """Rebuild the employee dicts in the JSON file layout."""
+        parents = self.parent_index
+        has_parent = np.flatnonzero(parents >= 0)
+        children = has_parent[np.argsort(parents[has_parent], kind='stable')]
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents[has_parent], minlength=len(self)), out=offsets[1:])
+
+        ids = self.ids.tolist()
+        child_ids = self.ids[children].tolist()
+        offsets = offsets.tolist()
+        levels = self.level.tolist()
+        managers = self.manager_id.tolist()
+        positions = [self.positions[code] for code in self.position_code.tolist()]
+        teams = self.team_code.tolist()
+
+        records = []
+        for i, emp_id in enumerate(ids):
+            record = {'id': emp_id, 'position': positions[i]}
+            if self.has_teams:
+                record['team_type'] = self.teams[teams[i]] if teams[i] >= 0 else None
+            record['level'] = levels[i]
+            record['manager_id'] = None if managers[i] == NO_MANAGER else managers[i]
+            record['subordinates'] = child_ids[offsets[i]:offsets[i + 1]]
+            records.append(record)
+        return records
+
+def binary_path_for(json_path: str) -> str:
+    """Default location of the binary cache for an org JSON file."""
+    return os.path.splitext(json_path)[0] + BINARY_EXTENSION
+
+def _source_signature(path: str) -> Optional[Dict]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def write_binary(org: OrgData, path: str, source: Optional[str] = None):
+    """Write `org` in the memory-mappable binary format.
+
+    When `source` is given its size and modification time are recorded so
+    `load_org` can tell whether the binary file is stale.
+    """
+    arrays = {name: np.ascontiguousarray(getattr(org, name), dtype=dtype)
+              for name, dtype in ARRAY_DTYPES.items()}
+    header = {
+        'count': len(org),
+        'positions': org.positions,
+        'teams': org.teams,
+        'has_teams': org.has_teams,
+        'source': _source_signature(source) if source else None,
+        'arrays': {},
+    }
+
+    # Arrays follow the header, at aligned offsets relative to the data start
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = {'dtype': array.dtype.str, 'offset': offset}
+        offset = -(-(offset + array.nbytes) // ALIGNMENT) * ALIGNMENT
+    encoded = json.dumps(header).encode()
+    data_start = _data_start(len(encoded))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, 'little'))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(data_start + header['arrays'][name]['offset'])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+def _data_start(header_len: int) -> int:
+    return -(-(len(MAGIC) + 8 + header_len) // ALIGNMENT) * ALIGNMENT
+
+def read_binary(path: str) -> OrgData:
+    """Memory-map a binary org file written by `write_binary`."""
+    header, buffer = _open_binary(path)
+    data_start = _data_start(int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8], 'little'))
+    arrays = {
+        name: np.frombuffer(buffer, dtype=np.dtype(spec['dtype']),
+                            count=header['count'], offset=data_start + spec['offset'])
+        for name, spec in header['arrays'].items()
+    }
+    return OrgData(positions=header['positions'], teams=header['teams'],
+                   has_teams=header['has_teams'], **arrays)
+
+def _open_binary(path: str):
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a binary org file")
+    header_len = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8], 'little')
+    start = len(MAGIC) + 8
+    return json.loads(buffer[start:start + header_len]), buffer
+
+def _read_header(path: str) -> Optional[Dict]:
+    try:
+        header, buffer = _open_binary(path)
+    except (OSError, ValueError):
+        return None
+    buffer.close()
+    return header
+
+def is_stale(json_path: str, binary_path: str) -> bool:
+    """True when the binary file is missing or was built from another version of the JSON."""
+    header = _read_header(binary_path)
+    if header is None:
+        return True
+    source = _source_signature(json_path)
+    return source is not None and header['source'] != source
+
+def load_org(json_path: str = 'company_structure.json', binary_path: Optional[str] = None,
+             rebuild: bool = True) -> OrgData:
+    """Load an org structure, preferring the memory-mapped binary copy.
+
+    Falls back to streaming the JSON (array or NDJSON) when the binary file
+    is missing or older than the JSON, and (unless `rebuild` is False)
+    refreshes the binary file for the next caller.
+    """
+    binary_path = binary_path or binary_path_for(json_path)
+    if not is_stale(json_path, binary_path):
+        return read_binary(binary_path)
+
+    org = OrgData.from_records(iter_records(json_path))
+    if rebuild:
+        try:
+            write_binary(org, binary_path, source=json_path)
+        except OSError:
+            pass
+    return org
+
+def load_records(json_path: str = 'company_structure.json') -> List[Dict]:
+    """Employee dicts for code that still works record by record."""
+    binary_path = binary_path_for(json_path)
+    if not is_stale(json_path, binary_path):
+        return read_binary(binary_path).to_records()
+
+    records = list(iter_records(json_path))
+    try:
+        write_binary(OrgData.from_records(records), binary_path, source=json_path)
+    except OSError:
+        pass
+    return records
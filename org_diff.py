@@ -0,0 +1,225 @@
+import sys
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Tuple, Union
+from org_data import NO_MANAGER, OrgData, load_org
+
+# Team label used for snapshots without a team_type field
+DEFAULT_TEAM = 'All'
+
+Snapshot = Union[OrgData, str]
+
+def _union(first: List[str], second: List[str]) -> List[str]:
+    return list(dict.fromkeys([*first, *second]))
+
+def _recode(names: List[str], table: List[str]) -> np.ndarray:
+    """Map codes into `names` onto codes into the combined `table`."""
+    index = {name: i for i, name in enumerate(table)}
+    return np.array([index[name] for name in names], dtype=np.int64)
+
+def _team_codes(org: OrgData, teams: List[str]) -> np.ndarray:
+    """Row -> code into `teams` (employees without a team get DEFAULT_TEAM)."""
+    if not org.has_teams:
+        return np.full(len(org), teams.index(DEFAULT_TEAM), dtype=np.int64)
+    fallback = teams.index(DEFAULT_TEAM) if DEFAULT_TEAM in teams else -1
+    recode = np.append(_recode(org.teams, teams), fallback)
+    return recode[org.team_code]
+
+def _take(values: np.ndarray, rows: np.ndarray, fill: int) -> np.ndarray:
+    """`values[rows]` with `fill` where the row is -1 (`values` may be empty)."""
+    result = np.full(len(rows), fill, dtype=values.dtype)
+    present = rows >= 0
+    result[present] = values[rows[present]]
+    return result
+
+def _team_names(org: OrgData) -> List[str]:
+    if org.has_teams and not (org.team_code < 0).any():
+        return list(org.teams)
+    return [*org.teams, DEFAULT_TEAM]
+
+class OrgDiff:
+    """Differences between two snapshots of an org structure.
+
+    Employees are joined on id through the id lookup table of the later
+    snapshot, so the diff is a handful of linear array passes. Position and
+    team codes are translated into shared tables first because every
+    snapshot numbers its strings independently.
+    """
+
+    def __init__(self, before: OrgData, after: OrgData):
+        self.before = before
+        self.after = after
+
+        # Join: row in `after` of each row in `before` (-1 for leavers)
+        match = after.index_of(before.ids)
+        self.leavers = np.flatnonzero(match < 0)
+        self.stay_before = np.flatnonzero(match >= 0)
+        self.stay_after = match[self.stay_before]
+        matched = np.zeros(len(after), dtype=bool)
+        matched[self.stay_after] = True
+        self.joiners = np.flatnonzero(~matched)
+
+        self.positions = _union(before.positions, after.positions)
+        self.position_before = _recode(before.positions, self.positions)[before.position_code]
+        self.position_after = _recode(after.positions, self.positions)[after.position_code]
+
+        self.teams = _union(_team_names(before), _team_names(after))
+        self.team_before = _team_codes(before, self.teams)
+        self.team_after = _team_codes(after, self.teams)
+
+        self.position_changed = (self.position_before[self.stay_before] !=
+                                 self.position_after[self.stay_after])
+        self.manager_changed = (before.manager_id[self.stay_before] !=
+                                after.manager_id[self.stay_after])
+        self.team_changed = self.team_before[self.stay_before] != self.team_after[self.stay_after]
+
+    def summary(self) -> Dict:
+        average = (len(self.before) + len(self.after)) / 2
+        return {
+            'headcount_before': len(self.before),
+            'headcount_after': len(self.after),
+            'joiners': len(self.joiners),
+            'leavers': len(self.leavers),
+            'position_changes': int(self.position_changed.sum()),
+            'manager_changes': int(self.manager_changed.sum()),
+            'team_moves': int(self.team_changed.sum()),
+            'turnover_rate': len(self.leavers) / average if average else 0.0,
+        }
+
+    def team_turnover(self) -> pd.DataFrame:
+        """Per-team headcounts, flows and turnover rate.
+
+        The turnover rate is leavers over the average of the team's headcount
+        in the two snapshots; moves between teams are counted separately.
+        """
+        teams = len(self.teams)
+        moved = self.team_changed
+        headcount_before = np.bincount(self.team_before, minlength=teams)
+        headcount_after = np.bincount(self.team_after, minlength=teams)
+        leavers = np.bincount(self.team_before[self.leavers], minlength=teams)
+        average = (headcount_before + headcount_after) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = np.where(average > 0, leavers / average, np.nan)
+
+        return pd.DataFrame({
+            'headcount_before': headcount_before,
+            'headcount_after': headcount_after,
+            'joiners': np.bincount(self.team_after[self.joiners], minlength=teams),
+            'leavers': leavers,
+            'moved_in': np.bincount(self.team_after[self.stay_after[moved]], minlength=teams),
+            'moved_out': np.bincount(self.team_before[self.stay_before[moved]], minlength=teams),
+            'turnover_rate': rate,
+        }, index=pd.Index(self.teams, name='team_type'))
+
+    def changes(self) -> pd.DataFrame:
+        """One row per joiner, leaver and employee whose position, manager or team changed."""
+        changed = self.position_changed | self.manager_changed | self.team_changed
+        before_rows = np.concatenate([self.leavers, np.full(len(self.joiners), -1),
+                                      self.stay_before[changed]])
+        after_rows = np.concatenate([np.full(len(self.leavers), -1), self.joiners,
+                                     self.stay_after[changed]])
+        kind = np.repeat(np.arange(3), [len(self.leavers), len(self.joiners), int(changed.sum())])
+        # -1 rows (no counterpart in that snapshot) are filled rather than indexed
+        ids = np.where(before_rows >= 0, _take(self.before.ids, before_rows, -1),
+                       _take(self.after.ids, after_rows, -1))
+
+        def column(values_before, values_after, categories):
+            return (pd.Categorical.from_codes(_take(values_before, before_rows, -1), categories=categories),
+                    pd.Categorical.from_codes(_take(values_after, after_rows, -1), categories=categories))
+
+        old_position, new_position = column(self.position_before, self.position_after, self.positions)
+        old_team, new_team = column(self.team_before, self.team_after, self.teams)
+        old_manager = _take(self.before.manager_id, before_rows, NO_MANAGER)
+        new_manager = _take(self.after.manager_id, after_rows, NO_MANAGER)
+
+        return pd.DataFrame({
+            'employee_id': ids,
+            'change': pd.Categorical.from_codes(kind, categories=['left', 'joined', 'changed']),
+            'old_position': old_position,
+            'new_position': new_position,
+            'old_manager_id': pd.array(np.where(old_manager == NO_MANAGER, None, old_manager), dtype='Int64'),
+            'new_manager_id': pd.array(np.where(new_manager == NO_MANAGER, None, new_manager), dtype='Int64'),
+            'old_team': old_team,
+            'new_team': new_team,
+        })
+
+def _as_org(snapshot: Snapshot) -> OrgData:
+    return load_org(snapshot) if isinstance(snapshot, str) else snapshot
+
+def diff_snapshots(before: Snapshot, after: Snapshot) -> OrgDiff:
+    return OrgDiff(_as_org(before), _as_org(after))
+
+def turnover_series(snapshots: Iterable[Tuple[object, Snapshot]]) -> pd.DataFrame:
+    """Team turnover between each pair of consecutive (date, snapshot) entries.
+
+    Snapshots may be loaded orgs or file paths; only two are held at a time.
+    Rows are indexed by (date, team_type), dated by the later snapshot of
+    each pair, so the result joins directly onto survey data grouped by
+    date and team.
+    """
+    frames = []
+    previous = None
+    for date, snapshot in snapshots:
+        org = _as_org(snapshot)
+        if previous is not None:
+            frame = OrgDiff(previous, org).team_turnover().reset_index()
+            frame.insert(0, 'date', pd.Timestamp(date))
+            frames.append(frame)
+        previous = org
+
+    if not frames:
+        columns = ['date', 'team_type', 'headcount_before', 'headcount_after', 'joiners',
+                   'leavers', 'moved_in', 'moved_out', 'turnover_rate']
+        return pd.DataFrame(columns=columns).set_index(['date', 'team_type'])
+    return pd.concat(frames, ignore_index=True).set_index(['date', 'team_type'])
+
+def print_org_diff(diff: OrgDiff):
+    summary = diff.summary()
+    print("\n=== ORG SNAPSHOT DIFF ===\n")
+    print(f"Headcount: {summary['headcount_before']} -> {summary['headcount_after']}")
+    print(f"Joiners: {summary['joiners']}")
+    print(f"Leavers: {summary['leavers']} (turnover {summary['turnover_rate']:.1%})")
+    print(f"Position changes: {summary['position_changes']}")
+    print(f"Manager changes: {summary['manager_changes']}")
+    print(f"Team moves: {summary['team_moves']}")
+
+    print("\nTURNOVER BY TEAM:")
+    for row in diff.team_turnover().itertuples():
+        print(f"{row.Index}: {row.headcount_before} -> {row.headcount_after} "
+              f"(+{row.joiners} joined, -{row.leavers} left, "
+              f"{row.moved_in} moved in, {row.moved_out} moved out, "
+              f"turnover {row.turnover_rate:.1%})")
+
+def test_org_diff():
+    """Diff against an empty snapshot in both directions."""
+    try:
+        org = OrgData.from_records([
+            {'id': 1, 'position': 'CEO', 'level': 1, 'manager_id': None, 'team_type': 'Software'},
+            {'id': 2, 'position': 'Software Engineer', 'level': 0, 'manager_id': 1, 'team_type': 'Software'},
+        ])
+        empty = OrgData.from_records([])
+
+        hired = OrgDiff(empty, org)
+        assert hired.summary()['joiners'] == 2
+        changes = hired.changes()
+        assert changes['employee_id'].tolist() == [1, 2]
+        assert (changes['change'] == 'joined').all()
+        assert changes['old_position'].isna().all()
+
+        closed = OrgDiff(org, empty)
+        assert closed.summary()['leavers'] == 2
+        changes = closed.changes()
+        assert (changes['change'] == 'left').all()
+        assert changes['old_manager_id'].tolist()[1] == 1
+        print("✓ Diffed against an empty snapshot")
+        return True
+
+    except Exception as e:
+        print(f"✗ Error diffing empty snapshot: {e!r}")
+        return False
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python org_diff.py BEFORE.json AFTER.json")
+        sys.exit(1)
+    print_org_diff(diff_snapshots(sys.argv[1], sys.argv[2]))
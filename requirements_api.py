@@ -1,16 +1,38 @@
 #!/usr/bin/env python3
-from fastapi import FastAPI, HTTPException, Depends
+import json
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Body, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
 from datetime import datetime
 from requirements_manager import (
-    RequirementsManager, RequirementType, 
-    RequirementStatus, UseCaseStatus
+    AsyncRequirementsManager, RequirementsManager, RequirementType, 
+    RequirementStatus, UseCaseStatus, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    create_client, pool_options_from_env, serialize_document
 )
 
-app = FastAPI(title="Requirements Management API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open one pooled MongoDB client for the whole process."""
+    client = create_client()
+    # Indexes are created once here rather than on every request
+    RequirementsManager(client=client)
+    app.state.mongo_client = client
+    # One worker thread per pooled connection runs the blocking pymongo calls
+    app.state.mongo_executor = ThreadPoolExecutor(
+        max_workers=pool_options_from_env()['maxPoolSize'] or None,
+        thread_name_prefix='mongo')
+    try:
+        yield
+    finally:
+        app.state.mongo_executor.shutdown(wait=True)
+        client.close()
+
+app = FastAPI(title="Requirements Management API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -78,22 +100,20 @@ class UseCaseCreate(BaseModel):
         return v
 
 # Dependency to get RequirementsManager instance
-def get_requirements_manager():
-    manager = RequirementsManager()
-    try:
-        yield manager
-    finally:
-        manager.close()
+def get_requirements_manager(request: Request) -> AsyncRequirementsManager:
+    # Lightweight collection handles over the shared, pooled client
+    manager = RequirementsManager(client=request.app.state.mongo_client, setup_indexes=False)
+    return AsyncRequirementsManager(manager, request.app.state.mongo_executor)
 
 # API Routes
 @app.post("/requirements/", response_model=dict)
 async def create_requirement(
     requirement: RequirementCreate,
-    manager: RequirementsManager = Depends(get_requirements_manager)
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
 ):
     """Create a new requirement with validation."""
     try:
-        req_id = manager.create_requirement(requirement.model_dump())
+        req_id = await manager.create_requirement(requirement.model_dump())
         return {"id": req_id, "status": "success"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -101,67 +121,152 @@ async def create_requirement(
 @app.post("/use-cases/", response_model=dict)
 async def create_use_case(
     use_case: UseCaseCreate,
-    manager: RequirementsManager = Depends(get_requirements_manager)
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
 ):
     """Create a new use case with validation."""
     try:
-        uc_id = manager.create_use_case(use_case.model_dump())
+        uc_id = await manager.create_use_case(use_case.model_dump())
         return {"id": uc_id, "status": "success"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# Largest batch accepted by the bulk import endpoints
+MAX_BULK_ITEMS = 10000
+
+def validate_items(model, items: List[Dict[str, Any]]):
+    """Validate each raw item on its own: (index, validated dict) pairs and per-item errors."""
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item).model_dump()))
+        except ValidationError as e:
+            errors.append({"index": index, "error": str(e)})
+    return valid, errors
+
+async def bulk_import(model, items: List[Dict[str, Any]], create) -> Dict[str, Any]:
+    """Validate, then import the valid items in one batch, reporting every item."""
+    valid, errors = validate_items(model, items)
+    try:
+        result = await create([data for _, data in valid]) if valid else {"results": []}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Map batch positions back to positions in the request
+    results = errors + [{**item, "index": valid[item["index"]][0]} for item in result["results"]]
+    results.sort(key=lambda item: item["index"])
+    failed = sum(1 for item in results if "error" in item)
+    return {"inserted": len(results) - failed, "failed": failed, "results": results}
+
+@app.post("/requirements/bulk", response_model=dict)
+async def bulk_create_requirements(
+    items: List[Dict[str, Any]] = Body(...),
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
+):
+    """Import many requirements; each item is validated and reported separately."""
+    return await bulk_import(RequirementCreate, items, manager.bulk_create_requirements)
+
+@app.post("/use-cases/bulk", response_model=dict)
+async def bulk_create_use_cases(
+    items: List[Dict[str, Any]] = Body(...),
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
+):
+    """Import many use cases; each item is validated and reported separately."""
+    return await bulk_import(UseCaseCreate, items, manager.bulk_create_use_cases)
+
 @app.get("/requirements/{req_id}/trace")
 async def get_requirement_trace(
     req_id: str,
-    manager: RequirementsManager = Depends(get_requirements_manager)
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
 ):
     """Get requirement traceability matrix."""
     try:
-        trace = manager.get_requirement_trace(req_id)
-        return trace
+        trace = await manager.get_requirement_trace(req_id)
+        return serialize_document(trace)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated `fields=` parameter as a list of field names."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+async def list_documents(key: str, page, stream, query: Dict[str, Any], limit: int,
+                         cursor: Optional[str], fields: Optional[str], format: str):
+    """Shared body of the list endpoints: one keyset page, or an NDJSON export."""
+    try:
+        field_list = parse_fields(fields)
+        if format == "ndjson":
+            documents = stream(query, cursor, field_list)
+            # Fail on a bad cursor or field list before the response starts
+            first = await documents.__anext__()
+        else:
+            result = await page(query, limit, cursor, field_list)
+    except StopAsyncIteration:
+        return StreamingResponse(iter(()), media_type="application/x-ndjson")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if format == "ndjson":
+        async def lines():
+            yield json.dumps(serialize_document(first)) + "\n"
+            async for document in documents:
+                yield json.dumps(serialize_document(document)) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    return {key: serialize_document(result["items"]), "next_cursor": result["next_cursor"]}
+
 @app.get("/requirements/")
 async def list_requirements(
     status: Optional[RequirementStatus] = None,
     type: Optional[RequirementType] = None,
     priority: Optional[int] = None,
-    manager: RequirementsManager = Depends(get_requirements_manager)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
 ):
-    """List requirements with optional filters."""
-    try:
-        query = {}
-        if status:
-            query["status"] = status.value
-        if type:
-            query["type"] = type.value
-        if priority:
-            query["priority"] = priority
-        
-        requirements = list(manager.requirements.find(query))
-        return {"requirements": requirements}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """List requirements with optional filters.
+
+    Results are ordered by priority and paged: pass `next_cursor` back as
+    `cursor` for the next page. `fields` is a comma-separated projection and
+    ``format=ndjson`` streams every match as newline-delimited JSON.
+    """
+    query = {}
+    if status:
+        query["status"] = status.value
+    if type:
+        query["type"] = type.value
+    if priority:
+        query["priority"] = priority
+    
+    return await list_documents("requirements", manager.page_requirements, manager.iter_requirements,
+                                query, limit, cursor, fields, format)
 
 @app.get("/use-cases/")
 async def list_use_cases(
     status: Optional[UseCaseStatus] = None,
     priority: Optional[int] = None,
-    manager: RequirementsManager = Depends(get_requirements_manager)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    manager: AsyncRequirementsManager = Depends(get_requirements_manager)
 ):
-    """List use cases with optional filters."""
-    try:
-        query = {}
-        if status:
-            query["status"] = status.value
-        if priority:
-            query["priority"] = priority
-        
-        use_cases = list(manager.use_cases.find(query))
-        return {"use_cases": use_cases}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """List use cases with optional filters, paged like `list_requirements`."""
+    query = {}
+    if status:
+        query["status"] = status.value
+    if priority:
+        query["priority"] = priority
+    
+    return await list_documents("use_cases", manager.page_use_cases, manager.iter_use_cases,
+                                query, limit, cursor, fields, format)
 
 if __name__ == "__main__":
     import uvicorn
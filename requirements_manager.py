@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
 import os
-from typing import Dict, Any, List, Optional
+import json
+import base64
+import asyncio
+import binascii
+import functools
+import importlib.util
+import itertools
+import threading
+from concurrent.futures import Executor
+from typing import Dict, Any, Iterator, List, Optional, AsyncIterator
 from datetime import datetime
 from enum import Enum
 from bson import ObjectId
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError
 from pymongo.database import Database
 from dotenv import load_dotenv
 
@@ -32,17 +42,201 @@ class UseCaseStatus(Enum):
     IMPLEMENTED = "implemented"
     TESTED = "tested"
 
+# Connection pool settings: environment variable -> MongoClient option
+POOL_SETTINGS = {
+    'MONGODB_MAX_POOL_SIZE': ('maxPoolSize', 100),
+    'MONGODB_MIN_POOL_SIZE': ('minPoolSize', 0),
+    'MONGODB_MAX_IDLE_TIME_MS': ('maxIdleTimeMS', None),
+    'MONGODB_CONNECT_TIMEOUT_MS': ('connectTimeoutMS', 5000),
+    'MONGODB_SERVER_SELECTION_TIMEOUT_MS': ('serverSelectionTimeoutMS', 5000),
+    'MONGODB_SOCKET_TIMEOUT_MS': ('socketTimeoutMS', None),
+    'MONGODB_WAIT_QUEUE_TIMEOUT_MS': ('waitQueueTimeoutMS', None),
+}
+
+def pool_options_from_env() -> Dict[str, int]:
+    """MongoClient pool size and timeout options, from the environment or defaults."""
+    options = {}
+    for env_name, (option, default) in POOL_SETTINGS.items():
+        value = os.getenv(env_name)
+        if value not in (None, ''):
+            options[option] = int(value)
+        elif default is not None:
+            options[option] = default
+    return options
+
+# Page sizes for keyset-paginated listings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Listings are ordered by priority (1 = highest), then insertion order
+PAGE_SORT = [("priority", ASCENDING), ("_id", ASCENDING)]
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past `document` in PAGE_SORT order."""
+    position = {"p": document.get("priority"), "i": str(document["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Query matching everything after the cursor's position."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        priority, last_id = position["p"], ObjectId(position["i"])
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return {"$or": [
+        {"priority": {"$gt": priority}},
+        {"priority": priority, "_id": {"$gt": last_id}}
+    ]}
+
+def projection_for(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+    """Projection keeping `fields` plus the keys needed for paging."""
+    if not fields:
+        return None
+    for field in fields:
+        if not field or field.startswith('$'):
+            raise ValueError(f"Invalid field name: {field!r}")
+    return {field: 1 for field in ["_id", "priority", *fields]}
+
+def serialize_document(value: Any) -> Any:
+    """Copy of a MongoDB document with ObjectIds turned into strings."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: serialize_document(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [serialize_document(item) for item in value]
+    return value
+
+# Ids leased from the sequences collection per round trip
+DEFAULT_ID_BLOCK_SIZE = 1000
+
+class SequenceBlockAllocator:
+    """Hands out sequence numbers from blocks leased with one atomic `$inc`.
+
+    Each lease moves the shared counter forward by `block_size`, so the
+    numbers in a lease belong to this process alone and are given out
+    under a lock without further round trips. Numbers stay unique across
+    processes and restarts, but a process that exits with part of a block
+    unused leaves a gap. A forked child drops the lease it inherited.
+    The sequences collection is passed on each call rather than held.
+    """
+    
+    def __init__(self, name: str, block_size: int = DEFAULT_ID_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.name = name
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0  # one past the last leased number
+        self._pid = os.getpid()
+    
+    def _lease(self, sequences, count: int):
+        sequence = sequences.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"seq": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._end = sequence["seq"] + 1
+        self._next = self._end - count
+    
+    def take(self, sequences, count: int = 1) -> List[int]:
+        """`count` unused sequence numbers, in increasing order."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._next = self._end = 0
+                self._pid = os.getpid()
+            
+            numbers = list(range(self._next, min(self._next + count, self._end)))
+            self._next += len(numbers)
+            missing = count - len(numbers)
+            if missing:
+                # Big requests lease everything they need in the same round trip
+                self._lease(sequences, max(missing, self.block_size))
+                numbers.extend(range(self._next, self._next + missing))
+                self._next += missing
+            return numbers
+    
+    def next(self, sequences) -> int:
+        return self.take(sequences, 1)[0]
+
+_allocators: Dict[tuple, SequenceBlockAllocator] = {}
+_allocators_lock = threading.Lock()
+
+def _connection_key(client) -> tuple:
+    """The deployment a client talks to: its seed list and replica set.
+
+    Clients built separately for the same URI get the same key. A
+    mongomock client is identified by its in-process store instead.
+    """
+    if not isinstance(client, MongoClient):
+        return ('mongomock', id(client._store))
+    settings = client._topology_settings
+    return (tuple(sorted(settings.seeds)), settings.replica_set_name)
+
+def get_sequence_allocator(db: Database, name: str,
+                           block_size: Optional[int] = None) -> SequenceBlockAllocator:
+    """The process-wide allocator for one sequence of one database.
+
+    Allocators are keyed on the deployment and database rather than the
+    client object, so managers that each build their own client still
+    share one lease. Block size comes from REQUIREMENTS_ID_BLOCK_SIZE
+    unless given; 1 gives the old one-round-trip-per-id behaviour.
+    """
+    key = (_connection_key(db.client), db.name, name)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            if block_size is None:
+                block_size = int(os.getenv('REQUIREMENTS_ID_BLOCK_SIZE', DEFAULT_ID_BLOCK_SIZE))
+            allocator = SequenceBlockAllocator(name, block_size)
+            _allocators[key] = allocator
+        return allocator
+
+# In-process database shared by every mongomock:// client, like one server
+_mongomock_store = None
+
+def _client_for_uri(mongo_uri: str, **options) -> MongoClient:
+    """MongoClient for `mongo_uri`; ``mongomock://`` gives an in-process stand-in."""
+    global _mongomock_store
+    if mongo_uri.startswith('mongomock://'):
+        import mongomock  # only needed for local runs without a MongoDB server
+        if _mongomock_store is None:
+            _mongomock_store = mongomock.store.ServerStore()
+        return mongomock.MongoClient(_store=_mongomock_store)
+    return MongoClient(mongo_uri, **options)
+
+def create_client(mongo_uri: Optional[str] = None, **options) -> MongoClient:
+    """Create a pooled MongoClient to share across the whole process.
+
+    Pool options come from `pool_options_from_env`; keyword arguments
+    override them.
+    """
+    load_dotenv()
+    mongo_uri = mongo_uri or os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+    return _client_for_uri(mongo_uri, **{**pool_options_from_env(), **options})
+
 class RequirementsManager:
     """Requirements and Use Case Management System."""
     
-    def __init__(self):
-        """Initialize the requirements manager."""
-        load_dotenv()
-        
+    def __init__(self, client: Optional[MongoClient] = None, db_name: Optional[str] = None,
+                 setup_indexes: bool = True):
+        """Initialize the requirements manager.
+
+        With a shared `client` the manager only holds collection handles:
+        it does not reload the environment, and `close` leaves the client
+        open. Pass ``setup_indexes=False`` when the indexes already exist.
+        """
         # MongoDB connection
-        self.mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
-        self.db_name = os.getenv('MONGODB_DB', 'survey_analytics')
-        self.client = MongoClient(self.mongo_uri)
+        self._owns_client = client is None
+        if client is None:
+            load_dotenv()
+            self.mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+            client = _client_for_uri(self.mongo_uri)
+        self.db_name = db_name or os.getenv('MONGODB_DB', 'survey_analytics')
+        self.client = client
         self.db = self.client[self.db_name]
         
         # Collections
@@ -53,7 +247,8 @@ class RequirementsManager:
         self.history = self.db['requirement_history']
         
         # Create indexes
-        self._setup_indexes()
+        if setup_indexes:
+            self._setup_indexes()
     
     def _setup_indexes(self):
         """Set up MongoDB indexes."""
@@ -62,11 +257,13 @@ class RequirementsManager:
         self.requirements.create_index([("status", ASCENDING)])
         self.requirements.create_index([("type", ASCENDING)])
         self.requirements.create_index([("priority", DESCENDING)])
+        self.requirements.create_index(PAGE_SORT)
         
         # Use cases indexes
         self.use_cases.create_index([("uc_id", ASCENDING)], unique=True)
         self.use_cases.create_index([("status", ASCENDING)])
         self.use_cases.create_index([("priority", DESCENDING)])
+        self.use_cases.create_index(PAGE_SORT)
         
         # Relationships index
         self.relationships.create_index([
@@ -74,24 +271,49 @@ class RequirementsManager:
             ("target_id", ASCENDING)
         ])
     
+    @staticmethod
+    def _requirement_document(data: Dict[str, Any], sequence: int, now: str) -> Dict[str, Any]:
+        return {
+            "req_id": f"REQ-{sequence}",
+            "title": data["title"],
+            "description": data["description"],
+            "type": data["type"].value,
+            "status": RequirementStatus.DRAFT.value,
+            "priority": data.get("priority", 3),  # 1 (highest) to 5 (lowest)
+            "stakeholders": data.get("stakeholders", []),
+            "acceptance_criteria": data.get("acceptance_criteria", []),
+            "dependencies": data.get("dependencies", []),
+            "created_at": now,
+            "updated_at": now,
+            "created_by": data.get("created_by", "system"),
+            "metadata": data.get("metadata", {})
+        }
+    
+    @staticmethod
+    def _use_case_document(data: Dict[str, Any], sequence: int, now: str) -> Dict[str, Any]:
+        return {
+            "uc_id": f"UC-{sequence}",
+            "title": data["title"],
+            "description": data["description"],
+            "actor": data["actor"],
+            "preconditions": data.get("preconditions", []),
+            "postconditions": data.get("postconditions", []),
+            "main_flow": data["main_flow"],
+            "alternative_flows": data.get("alternative_flows", []),
+            "status": UseCaseStatus.DRAFT.value,
+            "priority": data.get("priority", 3),
+            "requirements": data.get("requirements", []),
+            "created_at": now,
+            "updated_at": now,
+            "created_by": data.get("created_by", "system"),
+            "metadata": data.get("metadata", {})
+        }
+    
     def create_requirement(self, data: Dict[str, Any]) -> str:
         """Create a new requirement."""
         try:
-            requirement = {
-                "req_id": f"REQ-{self._get_next_sequence('requirements')}",
-                "title": data["title"],
-                "description": data["description"],
-                "type": data["type"].value,
-                "status": RequirementStatus.DRAFT.value,
-                "priority": data.get("priority", 3),  # 1 (highest) to 5 (lowest)
-                "stakeholders": data.get("stakeholders", []),
-                "acceptance_criteria": data.get("acceptance_criteria", []),
-                "dependencies": data.get("dependencies", []),
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "created_by": data.get("created_by", "system"),
-                "metadata": data.get("metadata", {})
-            }
+            requirement = self._requirement_document(
+                data, self._get_next_sequence('requirements'), datetime.now().isoformat())
             
             result = self.requirements.insert_one(requirement)
             
@@ -107,23 +329,8 @@ class RequirementsManager:
     def create_use_case(self, data: Dict[str, Any]) -> str:
         """Create a new use case."""
         try:
-            use_case = {
-                "uc_id": f"UC-{self._get_next_sequence('use_cases')}",
-                "title": data["title"],
-                "description": data["description"],
-                "actor": data["actor"],
-                "preconditions": data.get("preconditions", []),
-                "postconditions": data.get("postconditions", []),
-                "main_flow": data["main_flow"],
-                "alternative_flows": data.get("alternative_flows", []),
-                "status": UseCaseStatus.DRAFT.value,
-                "priority": data.get("priority", 3),
-                "requirements": data.get("requirements", []),
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "created_by": data.get("created_by", "system"),
-                "metadata": data.get("metadata", {})
-            }
+            use_case = self._use_case_document(
+                data, self._get_next_sequence('use_cases'), datetime.now().isoformat())
             
             result = self.use_cases.insert_one(use_case)
             
@@ -141,6 +348,89 @@ class RequirementsManager:
             print(f"Error creating use case: {str(e)}")
             raise
     
+    def bulk_create_requirements(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many requirements with a few batched writes.
+
+        Sequence numbers for the whole batch come from at most one `$inc`,
+        and the requirements and their history entries are written with
+        unordered `insert_many`, so one bad item does not stop the rest.
+        See `_bulk_insert` for the result layout.
+        """
+        return self._bulk_insert(self.requirements, 'requirements', items,
+                                 self._requirement_document, "requirement")
+    
+    def bulk_create_use_cases(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many use cases and their requirement links with batched writes.
+
+        A use case whose links fail to insert is counted as failed; its
+        result keeps the new ``id`` alongside the ``error``.
+        """
+        result = self._bulk_insert(self.use_cases, 'use_cases', items, self._use_case_document)
+        
+        # Link each inserted use case to its requirements in one batch
+        now = datetime.now().isoformat()
+        links, link_items = [], []
+        for item in result["results"]:
+            if "id" not in item:
+                continue
+            for req_id in items[item["index"]].get("requirements", []):
+                links.append({"source_id": item["id"], "target_id": req_id,
+                              "type": "implements", "created_at": now})
+                link_items.append(item["index"])
+        if links:
+            try:
+                self.relationships.insert_many(links, ordered=False)
+            except BulkWriteError as e:
+                failed_links: Dict[int, int] = {}
+                for error in e.details['writeErrors']:
+                    index = link_items[error['index']]
+                    failed_links[index] = failed_links.get(index, 0) + 1
+                for index, count in failed_links.items():
+                    result["results"][index]["error"] = f"Use case created but {count} requirement link(s) failed"
+                result["inserted"] -= len(failed_links)
+                result["failed"] += len(failed_links)
+        return result
+    
+    def _bulk_insert(self, collection, sequence_name: str, items: List[Dict[str, Any]],
+                     build, history_type: Optional[str] = None) -> Dict[str, Any]:
+        """Build, number and insert documents, collecting per-item errors.
+
+        Returns ``{"inserted": n, "failed": m, "results": [...]}`` where each
+        result holds the item's ``index`` and either its new ``id`` or an
+        ``error`` message, in input order.
+        """
+        now = datetime.now().isoformat()
+        errors: Dict[int, str] = {}
+        
+        # Validate everything first so failed items do not use up ids
+        valid = []
+        for index, data in enumerate(items):
+            try:
+                build(data, 0, now)
+                valid.append(index)
+            except (KeyError, AttributeError, TypeError) as e:
+                errors[index] = f"Invalid item: {e!r}"
+        
+        documents = []
+        if valid:
+            sequences = self._reserve_sequences(sequence_name, len(valid))
+            documents = [build(items[index], sequence, now) for sequence, index in zip(sequences, valid)]
+            try:
+                collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details['writeErrors']:
+                    errors[valid[error['index']]] = error.get('errmsg', 'write failed')
+        
+        inserted = {index: document for index, document in zip(valid, documents)
+                    if index not in errors}
+        if history_type and inserted:
+            self._record_history_many(history_type, "created", list(inserted.values()))
+        
+        results = [{"index": index, "error": errors[index]} if index in errors
+                   else {"index": index, "id": str(inserted[index]["_id"])}
+                   for index in range(len(items))]
+        return {"inserted": len(inserted), "failed": len(errors), "results": results}
+    
     def update_requirement_status(self, req_id: str, status: RequirementStatus) -> bool:
         """Update requirement status."""
         try:
@@ -217,16 +507,82 @@ class RequirementsManager:
             print(f"Error getting requirement trace: {str(e)}")
             raise
     
+    def find_requirements(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Requirements matching a MongoDB query."""
+        return list(self.requirements.find(query))
+    
+    def find_use_cases(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Use cases matching a MongoDB query."""
+        return list(self.use_cases.find(query))
+    
+    def page_requirements(self, query: Dict[str, Any], limit: int = DEFAULT_PAGE_SIZE,
+                          cursor: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """One page of requirements; see `_page`."""
+        return self._page(self.requirements, query, limit, cursor, fields)
+    
+    def page_use_cases(self, query: Dict[str, Any], limit: int = DEFAULT_PAGE_SIZE,
+                       cursor: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """One page of use cases; see `_page`."""
+        return self._page(self.use_cases, query, limit, cursor, fields)
+    
+    def iter_requirements(self, query: Dict[str, Any], cursor: Optional[str] = None,
+                          fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream every matching requirement in page order, batch by batch."""
+        return self._find_sorted(self.requirements, query, cursor, fields).batch_size(MAX_PAGE_SIZE)
+    
+    def iter_use_cases(self, query: Dict[str, Any], cursor: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream every matching use case in page order, batch by batch."""
+        return self._find_sorted(self.use_cases, query, cursor, fields).batch_size(MAX_PAGE_SIZE)
+    
+    def _find_sorted(self, collection, query: Dict[str, Any], cursor: Optional[str],
+                     fields: Optional[List[str]]):
+        if cursor:
+            query = {"$and": [query, decode_cursor(cursor)]} if query else decode_cursor(cursor)
+        return collection.find(query, projection_for(fields)).sort(PAGE_SORT)
+    
+    def _page(self, collection, query: Dict[str, Any], limit: int, cursor: Optional[str],
+              fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Keyset page ordered by (priority, _id).
+
+        Returns ``{"items": [...], "next_cursor": str or None}``; pass the
+        cursor back to get the following page. `limit` is capped at
+        MAX_PAGE_SIZE and `fields` restricts the returned keys.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        items = list(self._find_sorted(collection, query, cursor, fields).limit(limit + 1))
+        has_more = len(items) > limit
+        items = items[:limit]
+        return {
+            "items": items,
+            "next_cursor": encode_cursor(items[-1]) if has_more else None
+        }
+    
     def _get_next_sequence(self, name: str) -> int:
         """Get next sequence number for IDs."""
-        sequence_collection = self.db['sequences']
-        sequence = sequence_collection.find_one_and_update(
-            {"_id": name},
-            {"$inc": {"seq": 1}},
-            upsert=True,
-            return_document=True
-        )
-        return sequence["seq"]
+        return get_sequence_allocator(self.db, name).next(self.db['sequences'])
+    
+    def _reserve_sequences(self, name: str, count: int) -> List[int]:
+        """Reserve `count` sequence numbers, leasing more in one `$inc` if needed."""
+        return get_sequence_allocator(self.db, name).take(self.db['sequences'], count)
+    
+    def _record_history_many(self, item_type: str, action: str,
+                             documents: List[Dict[str, Any]]):
+        """Record one history entry per document in a single batch."""
+        try:
+            timestamp = datetime.now().isoformat()
+            self.history.insert_many([{
+                "item_type": item_type,
+                "item_id": str(document["_id"]),
+                "action": action,
+                "data": document,
+                "timestamp": timestamp
+            } for document in documents], ordered=False)
+            
+        except Exception as e:
+            print(f"Error recording history: {str(e)}")
     
     def _record_history(self, item_type: str, item_id: str, 
                        action: str, data: Dict[str, Any]):
@@ -246,8 +602,91 @@ class RequirementsManager:
             print(f"Error recording history: {str(e)}")
     
     def close(self):
-        """Close MongoDB connection."""
-        self.client.close()
+        """Close MongoDB connection (a shared client is left open)."""
+        if self._owns_client:
+            self.client.close()
+
+class AsyncRequirementsManager:
+    """Awaitable RequirementsManager for async code such as FastAPI routes.
+
+    Each call runs the blocking pymongo operation on `executor` (the event
+    loop's default thread pool when not given), so the event loop keeps
+    serving other requests while MongoDB answers. Size the executor to the
+    client's connection pool to use every pooled connection.
+    """
+    
+    def __init__(self, manager: RequirementsManager, executor: Optional[Executor] = None):
+        self.manager = manager
+        self.executor = executor
+    
+    async def _run(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(method, *args))
+    
+    async def create_requirement(self, data: Dict[str, Any]) -> str:
+        return await self._run(self.manager.create_requirement, data)
+    
+    async def create_use_case(self, data: Dict[str, Any]) -> str:
+        return await self._run(self.manager.create_use_case, data)
+    
+    async def bulk_create_requirements(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self._run(self.manager.bulk_create_requirements, items)
+    
+    async def bulk_create_use_cases(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self._run(self.manager.bulk_create_use_cases, items)
+    
+    async def update_requirement_status(self, req_id: str, status: RequirementStatus) -> bool:
+        return await self._run(self.manager.update_requirement_status, req_id, status)
+    
+    async def create_relationship(self, source_id: str, target_id: str,
+                                  relationship_type: str) -> str:
+        return await self._run(self.manager.create_relationship, source_id, target_id, relationship_type)
+    
+    async def get_requirement_trace(self, req_id: str) -> Dict[str, Any]:
+        return await self._run(self.manager.get_requirement_trace, req_id)
+    
+    async def find_requirements(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.find_requirements, query)
+    
+    async def find_use_cases(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.find_use_cases, query)
+    
+    async def page_requirements(self, query: Dict[str, Any], limit: int = DEFAULT_PAGE_SIZE,
+                                cursor: Optional[str] = None,
+                                fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self._run(self.manager.page_requirements, query, limit, cursor, fields)
+    
+    async def page_use_cases(self, query: Dict[str, Any], limit: int = DEFAULT_PAGE_SIZE,
+                             cursor: Optional[str] = None,
+                             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        return await self._run(self.manager.page_use_cases, query, limit, cursor, fields)
+    
+    async def iter_requirements(self, query: Dict[str, Any], cursor: Optional[str] = None,
+                                fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        async for document in self._stream(self.manager.iter_requirements, query, cursor, fields):
+            yield document
+    
+    async def iter_use_cases(self, query: Dict[str, Any], cursor: Optional[str] = None,
+                             fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        async for document in self._stream(self.manager.iter_use_cases, query, cursor, fields):
+            yield document
+    
+    async def _stream(self, method, *args) -> AsyncIterator[Dict[str, Any]]:
+        """Drain a blocking cursor one batch per executor call."""
+        documents = await self._run(method, *args)
+        try:
+            while True:
+                batch = await self._run(lambda: list(itertools.islice(documents, MAX_PAGE_SIZE)))
+                if not batch:
+                    break
+                for document in batch:
+                    yield document
+        finally:
+            if hasattr(documents, 'close'):
+                await self._run(documents.close)
+    
+    async def close(self):
+        await self._run(self.manager.close)
 
 def test_requirements_manager():
     """Test the requirements management system."""
@@ -301,5 +740,89 @@ def test_requirements_manager():
         print(f"✗ Error testing requirements manager: {str(e)}")
         return False
 
+def _mongomock_missing(test_name: str) -> Optional[bool]:
+    """Skip a mongomock-backed test locally, but fail it under CI.
+
+    mongomock comes from requirements-dev.txt; CI sets ``CI`` and must
+    never pass by skipping.
+    """
+    if os.getenv('CI'):
+        print(f"✗ {test_name} test needs mongomock (pip install -r requirements-dev.txt)")
+        return False
+    print(f"- Skipped {test_name} test (mongomock not installed; see requirements-dev.txt)")
+    return None
+
+def test_async_requirements_manager(concurrency: int = 200):
+    """Test the async manager against an in-process mongomock database."""
+    if importlib.util.find_spec('mongomock') is None:
+        return _mongomock_missing("async requirements manager")
+    
+    async def run():
+        client = _client_for_uri('mongomock://')
+        client.drop_database('async_manager_test')
+        manager = AsyncRequirementsManager(RequirementsManager(client=client, db_name='async_manager_test'))
+        req_id = await manager.create_requirement({
+            "title": "Audit Logging",
+            "description": "System must log all security relevant events",
+            "type": RequirementType.SECURITY,
+            "priority": 2
+        })
+        await manager.create_use_case({
+            "title": "Review Audit Log",
+            "description": "Allow an auditor to review logged events",
+            "actor": "Auditor",
+            "main_flow": ["1. Auditor opens the audit log"],
+            "requirements": [req_id]
+        })
+        
+        # Many overlapping reads on one event loop
+        traces = await asyncio.gather(*(manager.get_requirement_trace(req_id)
+                                        for _ in range(concurrency)))
+        listed = await manager.find_requirements({"type": RequirementType.SECURITY.value})
+        await manager.close()
+        return traces, listed
+    
+    try:
+        traces, listed = asyncio.run(run())
+        assert all(len(trace['use_cases']) == 1 for trace in traces)
+        assert len(listed) == 1
+        print(f"✓ Served {len(traces)} concurrent trace requests")
+        return True
+    
+    except Exception as e:
+        print(f"✗ Error testing async requirements manager: {str(e)}")
+        return False
+
+def test_sequence_allocation():
+    """Managers with their own clients for one database draw from one lease."""
+    if importlib.util.find_spec('mongomock') is None:
+        return _mongomock_missing("sequence allocation")
+    
+    try:
+        db_name = 'sequence_allocation_test'
+        _client_for_uri('mongomock://').drop_database(db_name)
+        managers = [RequirementsManager(client=_client_for_uri('mongomock://'), db_name=db_name)
+                    for _ in range(2)]
+        ids = []
+        for i in range(6):
+            manager = managers[i % 2]
+            doc_id = manager.create_requirement({
+                "title": f"Requirement {i}",
+                "description": "Sequence allocation check",
+                "type": RequirementType.FUNCTIONAL
+            })
+            ids.append(manager.requirements.find_one({"_id": ObjectId(doc_id)})["req_id"])
+        numbers = [int(req_id.split('-')[1]) for req_id in ids]
+        assert numbers == list(range(numbers[0], numbers[0] + len(numbers))), ids
+        print(f"✓ Two managers numbered {ids[0]}..{ids[-1]} contiguously")
+        return True
+    
+    except Exception as e:
+        print(f"✗ Error testing sequence allocation: {str(e)}")
+        return False
+
 if __name__ == "__main__":
-    test_requirements_manager()
+    results = [test_requirements_manager(), test_async_requirements_manager(),
+               test_sequence_allocation()]
+    # Skipped tests return None; only an explicit failure fails the run
+    raise SystemExit(1 if False in results else 0)
@@ -0,0 +1,197 @@
+import os
+import re
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from survey_store import METRICS
+from survey_stats import RATING_VALUES, rating_histograms, value_at_rank
+
+# Bump when a renderer changes so cached images are redrawn
+RENDER_VERSION = 1
+
+CACHE_FILE = '.figure_cache.json'
+
+# A figure job is (kind, payload); payloads hold only small aggregates
+FigureSpec = Tuple[str, Dict]
+
+def slugify(name: str) -> str:
+    """Lower-case `name` with every run of other characters replaced by '_'."""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'team'
+
+def precompute_aggregates(df: pd.DataFrame, per_team: bool = False) -> Dict[str, FigureSpec]:
+    """Aggregate the survey data once for every figure that will be drawn.
+
+    Returns a mapping of output file stem to figure spec. With ``per_team``
+    an extra happiness time series is produced for each team.
+    """
+    happiness = df.groupby(['team_type', 'date'], observed=True)['happiness_rating'].mean()
+    happiness = happiness.unstack('date')
+    teams = [str(team) for team in happiness.index]
+    dates = happiness.columns.to_numpy()
+
+    hist_teams, hist = rating_histograms(df, by=['team_type'])
+
+    specs = {
+        'happiness_over_time': ('time_series', {
+            'teams': teams,
+            'dates': dates,
+            'series': happiness.to_numpy(dtype=float),
+        }),
+        'ratings_distribution': ('box_plots', {
+            'teams': [str(team) for team in hist_teams],
+            'metrics': list(METRICS),
+            'hist': hist,
+        }),
+        'correlation_heatmap': ('heatmap', {
+            'metrics': list(METRICS),
+            'matrix': df[METRICS].astype(float).corr().to_numpy(),
+        }),
+    }
+
+    if per_team:
+        for i, team in enumerate(teams):
+            # Figure names become file names, so keep them to safe characters
+            name = f'happiness_over_time_{slugify(team)}'
+            if name in specs:
+                name = f'{name}_{i}'
+            specs[name] = ('time_series', {
+                'teams': [team],
+                'dates': dates,
+                'series': happiness.to_numpy(dtype=float)[i:i + 1],
+            })
+
+    return specs
+
+def spec_hash(spec: FigureSpec) -> str:
+    """Content hash of a figure spec, used as its cache key."""
+    kind, payload = spec
+    digest = hashlib.sha256(f'{RENDER_VERSION}:{kind}'.encode())
+    for key in sorted(payload):
+        value = payload[key]
+        digest.update(key.encode())
+        if isinstance(value, np.ndarray):
+            digest.update(str(value.dtype).encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(json.dumps(value).encode())
+    return digest.hexdigest()
+
+def _quantile_from_histogram(hist: np.ndarray, q: float) -> float:
+    """Linearly interpolated quantile of the ratings counted in `hist`."""
+    position = (hist.sum() - 1) * q
+    cumulative = np.cumsum(hist)
+    lower = value_at_rank(cumulative, np.array(int(np.floor(position))))
+    upper = value_at_rank(cumulative, np.array(int(np.ceil(position))))
+    return float(lower + (upper - lower) * (position - np.floor(position)))
+
+def box_stats_from_histogram(hist: np.ndarray, label: str) -> Dict:
+    """Box-and-whisker statistics for `Axes.bxp`, computed from rating counts."""
+    q1 = _quantile_from_histogram(hist, 0.25)
+    q3 = _quantile_from_histogram(hist, 0.75)
+    iqr = q3 - q1
+    present = RATING_VALUES[hist > 0]
+    inside = present[(present >= q1 - 1.5 * iqr) & (present <= q3 + 1.5 * iqr)]
+    return {
+        'label': label,
+        'med': _quantile_from_histogram(hist, 0.5),
+        'q1': q1,
+        'q3': q3,
+        'whislo': float(inside.min()),
+        'whishi': float(inside.max()),
+        'fliers': present[(present < inside.min()) | (present > inside.max())].astype(float),
+    }
+
+def _draw_time_series(fig: Figure, payload: Dict):
+    ax = fig.add_subplot()
+    for team, series in zip(payload['teams'], payload['series']):
+        ax.plot(payload['dates'], series, label=team, linewidth=2)
+    title = 'Average Happiness Rating Over Time'
+    if len(payload['teams']) == 1:
+        title += f" - {payload['teams'][0]} Team"
+    else:
+        title += ' by Team'
+    ax.set_title(title)
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Average Happiness Rating')
+    ax.legend()
+
+def _draw_box_plots(fig: Figure, payload: Dict):
+    axes = fig.subplots(1, len(payload['metrics']))
+    for i, (ax, metric) in enumerate(zip(np.atleast_1d(axes), payload['metrics'])):
+        boxes = [box_stats_from_histogram(payload['hist'][t, i], team)
+                 for t, team in enumerate(payload['teams'])]
+        ax.bxp(boxes, showfliers=True)
+        ax.set_title(metric.replace("_", " ").title())
+        ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+
+def _draw_heatmap(fig: Figure, payload: Dict):
+    ax = fig.add_subplot()
+    matrix = payload['matrix']
+    image = ax.imshow(matrix, cmap='coolwarm', vmin=-1, vmax=1)
+    ax.set_xticks(range(len(payload['metrics'])), labels=payload['metrics'], rotation=45)
+    ax.set_yticks(range(len(payload['metrics'])), labels=payload['metrics'])
+    for (row, col), value in np.ndenumerate(matrix):
+        ax.text(col, row, f'{value:.2f}', ha='center', va='center')
+    fig.colorbar(image, ax=ax)
+    ax.set_title('Correlation between Survey Metrics')
+    fig.tight_layout()
+
+DRAWERS = {
+    'time_series': (_draw_time_series, (15, 8)),
+    'box_plots': (_draw_box_plots, (15, 8)),
+    'heatmap': (_draw_heatmap, (10, 8)),
+}
+
+def render_figure(spec: FigureSpec, path: str) -> str:
+    """Render one figure spec to `path` with the Agg backend, without pyplot."""
+    kind, payload = spec
+    draw, figsize = DRAWERS[kind]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig, payload)
+    fig.savefig(path)
+    return path
+
+def render_figures(specs: Dict[str, FigureSpec], output_dir: str = '.',
+                   workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """Render every stale figure, in parallel, and skip the unchanged ones.
+
+    A manifest in `output_dir` maps each image to the hash of the aggregates
+    it was drawn from; an image is redrawn only when that hash changes or the
+    file is missing. Returns the lists of rendered and cached image paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+
+    jobs, cached = {}, []
+    hashes = {name: spec_hash(spec) for name, spec in specs.items()}
+    for name, spec in specs.items():
+        path = os.path.join(output_dir, f'{name}.png')
+        if cache.get(name) == hashes[name] and os.path.exists(path):
+            cached.append(path)
+        else:
+            jobs[name] = (spec, path)
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(render_figure, spec, path)
+                       for name, (spec, path) in jobs.items()}
+            rendered = [future.result() for future in futures.values()]
+    else:
+        rendered = [render_figure(spec, path) for spec, path in jobs.values()]
+
+    cache.update({name: hashes[name] for name in jobs})
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+    return {'rendered': rendered, 'cached': cached}
@@ -0,0 +1,251 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+# Rated survey questions, in the order they are asked
+METRICS = ['day_rating', 'accomplishment_rating', 'happiness_rating']
+
+# Every rating is an integer on a 1-5 scale
+RATING_MIN = 1
+RATING_MAX = 5
+
+# Column layout of a survey response table
+COLUMNS = ['employee_id', 'team_type', 'date'] + METRICS
+
+class SurveyColumnStore:
+    """Preallocated, typed columnar storage for survey responses.
+
+    Ratings are kept as int8, employee ids as int32, dates as datetime64[ns]
+    and teams as int8 codes into a shared category list. The pandas view of
+    the data is built once and cached until the next append.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self.teams: List[str] = []
+        self._size = 0
+        self._frame: Optional[pd.DataFrame] = None
+        self._columns = self._allocate(capacity)
+
+    @staticmethod
+    def _allocate(capacity: int) -> dict:
+        columns = {
+            'employee_id': np.empty(capacity, dtype=np.int32),
+            'team_type': np.empty(capacity, dtype=np.int8),
+            'date': np.empty(capacity, dtype='datetime64[ns]'),
+        }
+        for metric in METRICS:
+            columns[metric] = np.empty(capacity, dtype=np.int8)
+        return columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns['employee_id'])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the used part of every column."""
+        return sum(column[:self._size].nbytes for column in self._columns.values())
+
+    def reserve(self, capacity: int):
+        """Grow the column buffers so they can hold at least `capacity` rows."""
+        if capacity <= self.capacity:
+            return
+        columns = self._allocate(capacity)
+        for name, column in self._columns.items():
+            columns[name][:self._size] = column[:self._size]
+        self._columns = columns
+
+    def _team_codes(self, team_type) -> np.ndarray:
+        """Map team labels to codes, registering teams not seen before."""
+        teams = pd.Categorical(team_type)
+        for team in teams.categories:
+            if team not in self.teams:
+                self.teams.append(team)
+        if len(self.teams) > np.iinfo(np.int8).max:
+            raise ValueError("Too many distinct team types for int8 codes")
+        lookup = np.array([self.teams.index(team) for team in teams.categories],
+                          dtype=np.int8)
+        return lookup[teams.codes]
+
+    def append(self, frame: pd.DataFrame):
+        """Append a batch of survey responses with the standard columns."""
+        rows = len(frame)
+        if rows == 0:
+            return
+        end = self._size + rows
+        if end > self.capacity:
+            self.reserve(max(end, 2 * self.capacity))
+
+        batch = slice(self._size, end)
+        self._columns['employee_id'][batch] = frame['employee_id'].to_numpy()
+        self._columns['team_type'][batch] = self._team_codes(frame['team_type'])
+        self._columns['date'][batch] = frame['date'].to_numpy().astype('datetime64[ns]')
+        for metric in METRICS:
+            self._columns[metric][batch] = frame[metric].to_numpy()
+
+        self._size = end
+        self._frame = None
+
+    def clear(self):
+        """Drop all rows, keeping the capacity.
+
+        Frames from `to_frame` are views of the buffers, so fresh buffers
+        are allocated rather than overwriting rows a caller may still hold.
+        """
+        self._columns = self._allocate(self.capacity)
+        self._size = 0
+        self._frame = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the stored responses as a DataFrame (cached until data changes)."""
+        if self._frame is None:
+            size = self._size
+            data = {name: column[:size] for name, column in self._columns.items()}
+            data['team_type'] = pd.Categorical.from_codes(
+                data['team_type'], categories=list(self.teams))
+            self._frame = pd.DataFrame(data, columns=COLUMNS, copy=False)
+        return self._frame
+
+class PartitionedSurveyStore:
+    """On-disk survey responses partitioned by ISO year/week and team.
+
+    Each partition is a directory ``year=YYYY/week=WW/team=NAME`` holding one
+    ``.npy`` file per column. A JSON manifest records every partition's row
+    count and date range, so reads prune partitions by date and team
+    without touching the files, then memory-map only the ones needed.
+    """
+
+    MANIFEST = '_manifest.json'
+    STORED_COLUMNS = ['employee_id', 'date'] + METRICS
+
+    def __init__(self, root: str):
+        self.root = root
+        self._manifest_path = os.path.join(root, self.MANIFEST)
+        self.partitions: Dict[str, Dict] = {}
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, 'r') as f:
+                self.partitions = json.load(f)
+
+    def __len__(self) -> int:
+        return sum(part['rows'] for part in self.partitions.values())
+
+    @staticmethod
+    def _partition_key(year: int, week: int, team: str) -> str:
+        return f"year={year:04d}/week={week:02d}/team={quote(team, safe='')}"
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._manifest_path, 'w') as f:
+            json.dump(self.partitions, f, indent=2, sort_keys=True)
+
+    def _read_partition(self, key: str) -> Dict[str, np.ndarray]:
+        directory = os.path.join(self.root, key)
+        return {column: np.load(os.path.join(directory, f'{column}.npy'), mmap_mode='r')
+                for column in self.STORED_COLUMNS}
+
+    def write(self, frame: pd.DataFrame):
+        """Write survey responses, merging rows into any existing partitions."""
+        if len(frame) == 0:
+            return
+        dates = pd.DatetimeIndex(frame['date'])
+        calendar = dates.isocalendar()
+        keys = pd.DataFrame({
+            'year': calendar['year'].to_numpy(),
+            'week': calendar['week'].to_numpy(),
+            'team': frame['team_type'].astype(str).to_numpy(),
+        })
+        columns = {
+            'employee_id': frame['employee_id'].to_numpy().astype(np.int32),
+            'date': dates.to_numpy().astype('datetime64[ns]'),
+        }
+        for metric in METRICS:
+            columns[metric] = frame[metric].to_numpy().astype(np.int8)
+
+        for (year, week, team), rows in keys.groupby(['year', 'week', 'team']).indices.items():
+            key = self._partition_key(int(year), int(week), team)
+            data = {column: values[rows] for column, values in columns.items()}
+            if key in self.partitions:
+                existing = self._read_partition(key)
+                data = {column: np.concatenate([existing[column], data[column]])
+                        for column in self.STORED_COLUMNS}
+
+            directory = os.path.join(self.root, key)
+            os.makedirs(directory, exist_ok=True)
+            for column, values in data.items():
+                np.save(os.path.join(directory, f'{column}.npy'), values)
+
+            self.partitions[key] = {
+                'year': int(year),
+                'week': int(week),
+                'team': team,
+                'rows': int(len(data['date'])),
+                'min_date': str(data['date'].min()),
+                'max_date': str(data['date'].max()),
+            }
+
+        self._save_manifest()
+
+    def select_partitions(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                          teams: Optional[Iterable[str]] = None) -> List[str]:
+        """Keys of the partitions that may hold rows matching the predicates."""
+        start = np.datetime64(pd.Timestamp(start), 'ns') if start is not None else None
+        end = np.datetime64(pd.Timestamp(end), 'ns') if end is not None else None
+        teams = set(teams) if teams is not None else None
+
+        selected = []
+        for key, part in sorted(self.partitions.items()):
+            if teams is not None and part['team'] not in teams:
+                continue
+            if start is not None and np.datetime64(part['max_date'], 'ns') < start:
+                continue
+            if end is not None and np.datetime64(part['min_date'], 'ns') > end:
+                continue
+            selected.append(key)
+        return selected
+
+    def read(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             teams: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Load responses dated within [start, end] for the given teams.
+
+        Only the partitions selected by `select_partitions` are opened, and
+        rows are filtered only in partitions straddling the date bounds.
+        """
+        keys = self.select_partitions(start, end, teams)
+        start = np.datetime64(pd.Timestamp(start), 'ns') if start is not None else None
+        end = np.datetime64(pd.Timestamp(end), 'ns') if end is not None else None
+
+        team_names = sorted({self.partitions[key]['team'] for key in keys})
+        pieces = {column: [] for column in self.STORED_COLUMNS}
+        team_codes = []
+        for key in keys:
+            data = self._read_partition(key)
+            part = self.partitions[key]
+            mask = None
+            if start is not None and np.datetime64(part['min_date'], 'ns') < start:
+                mask = data['date'] >= start
+            if end is not None and np.datetime64(part['max_date'], 'ns') > end:
+                mask = (data['date'] <= end) if mask is None else mask & (data['date'] <= end)
+            rows = int(mask.sum()) if mask is not None else part['rows']
+            for column in self.STORED_COLUMNS:
+                pieces[column].append(data[column][mask] if mask is not None else data[column])
+            team_codes.append(np.full(rows, team_names.index(part['team']), dtype=np.int8))
+
+        def combine(arrays, dtype):
+            return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+
+        frame = pd.DataFrame({
+            'employee_id': combine(pieces['employee_id'], np.int32),
+            'team_type': pd.Categorical.from_codes(combine(team_codes, np.int8),
+                                                   categories=team_names),
+            'date': combine(pieces['date'], 'datetime64[ns]'),
+        })
+        for metric in METRICS:
+            frame[metric] = combine(pieces[metric], np.int8)
+        return frame
@@ -0,0 +1,157 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+from survey_store import METRICS
+
+# Contribution of each standardized feature to the risk score; positive
+# weights raise risk as the feature grows
+RISK_WEIGHTS = {
+    'rolling_mean': -1.0,
+    'rolling_mean_change': -0.75,
+    'happiness_slope': -1.0,
+    'volatility': 0.5,
+    'team_gap': -0.75,
+    'engagement': -0.5,
+}
+
+def _sorted_panel(frame: pd.DataFrame):
+    """Order rows by (employee, date) and locate each employee's run of rows."""
+    order = np.lexsort((frame['date'].to_numpy(), frame['employee_id'].to_numpy()))
+    employee_ids = frame['employee_id'].to_numpy()[order]
+    starts = np.flatnonzero(np.r_[True, employee_ids[1:] != employee_ids[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+    group = np.repeat(np.arange(len(starts)), sizes)
+    # Rows counted back from each employee's latest response (0 = latest)
+    from_end = np.repeat(starts + sizes - 1, sizes) - np.arange(len(order))
+    return order, employee_ids[starts], group, from_end, starts + sizes - 1
+
+def _group_mean(group: np.ndarray, values: np.ndarray, mask: np.ndarray, groups: int) -> np.ndarray:
+    count = np.bincount(group[mask], minlength=groups)
+    total = np.bincount(group[mask], weights=values[mask], minlength=groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return total / count
+
+def compute_risk_features(frame: pd.DataFrame, window: int = 8,
+                          metric: str = 'happiness_rating') -> pd.DataFrame:
+    """Per-employee turnover-risk features over the whole population at once.
+
+    All features use each employee's latest `window` responses:
+    the rolling mean of `metric`, its change against the preceding window,
+    the least-squares slope, the volatility of week-over-week changes, the
+    gap from the team's rolling mean and the mean of all metrics.
+    Returns one row per employee indexed by employee_id.
+    """
+    order, employee_ids, group, from_end, last_rows = _sorted_panel(frame)
+    groups = len(employee_ids)
+    values = frame[metric].to_numpy()[order].astype(np.float64)
+    recent = from_end < window
+    prior = (from_end >= window) & (from_end < 2 * window)
+
+    rolling_mean = _group_mean(group, values, recent, groups)
+    prior_mean = _group_mean(group, values, prior, groups)
+
+    # Least-squares slope over the window, with x counting weeks forward
+    x = (window - 1 - from_end).astype(np.float64)
+    g = group[recent]
+    n = np.bincount(g, minlength=groups)
+    sx = np.bincount(g, weights=x[recent], minlength=groups)
+    sy = np.bincount(g, weights=values[recent], minlength=groups)
+    sxx = np.bincount(g, weights=x[recent] ** 2, minlength=groups)
+    sxy = np.bincount(g, weights=x[recent] * values[recent], minlength=groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx ** 2)
+
+    # Volatility: std of week-over-week changes inside the window
+    change = np.r_[np.nan, np.diff(values)]
+    in_window_change = recent & (from_end < window - 1) & ~np.r_[True, group[1:] != group[:-1]]
+    change_mean = _group_mean(group, change, in_window_change, groups)
+    change_sq = _group_mean(group, change ** 2, in_window_change, groups)
+    volatility = np.sqrt(np.maximum(change_sq - change_mean ** 2, 0))
+
+    all_metrics = frame[METRICS].to_numpy()[order].mean(axis=1)
+    engagement = _group_mean(group, all_metrics, recent, groups)
+
+    teams = frame['team_type'].to_numpy()[order][last_rows]
+    team_codes, team_names = pd.factorize(teams)
+    team_baseline = (np.bincount(team_codes, weights=np.nan_to_num(rolling_mean)) /
+                     np.bincount(team_codes))
+
+    features = pd.DataFrame({
+        'team_type': pd.Categorical.from_codes(team_codes, categories=team_names),
+        'responses': np.bincount(group, minlength=groups),
+        'rolling_mean': rolling_mean,
+        'rolling_mean_change': rolling_mean - prior_mean,
+        'happiness_slope': np.nan_to_num(slope),
+        'volatility': volatility,
+        'team_gap': rolling_mean - team_baseline[team_codes],
+        'engagement': engagement,
+    }, index=pd.Index(employee_ids, name='employee_id'))
+    features['risk_score'] = risk_scores(features)
+    return features
+
+def risk_scores(features: pd.DataFrame, weights: Dict[str, float] = RISK_WEIGHTS) -> np.ndarray:
+    """Weighted sum of standardized features; higher means more at risk."""
+    score = np.zeros(len(features))
+    for name, weight in weights.items():
+        values = features[name].to_numpy(dtype=np.float64)
+        std = np.nanstd(values)
+        if std > 0:
+            score += weight * np.nan_to_num((values - np.nanmean(values)) / std)
+    return score
+
+def top_at_risk(features: pd.DataFrame, k: int = 20) -> pd.DataFrame:
+    """The `k` highest-risk employees, highest first."""
+    k = min(k, len(features))
+    scores = features['risk_score'].to_numpy()
+    candidates = np.argpartition(-scores, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+    ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+    result = features.iloc[ranked].copy()
+    result.insert(0, 'rank', np.arange(1, k + 1))
+    return result
+
+def synthetic_employees(count: int, teams: List[str] = ('Software', 'Hardware', 'Maintenance'),
+                        seed: int = 0) -> List[Dict]:
+    """Minimal employee records accepted by EmployeeSurveySystem."""
+    rng = np.random.default_rng(seed)
+    team_choice = rng.integers(0, len(teams), count)
+    return [{'id': i + 1, 'position': 'Support Specialist', 'team_type': teams[t]}
+            for i, t in enumerate(team_choice)]
+
+def benchmark(num_employees: int = 20000, num_weeks: int = 52, window: int = 8) -> Dict:
+    """Time feature scoring on a synthetic population (about 1M employee-weeks)."""
+    from employee_survey_analysis import EmployeeSurveySystem
+
+    system = EmployeeSurveySystem(employees=synthetic_employees(num_employees))
+    frame = system.generate_survey_frame(num_periods=num_weeks, seed=0)
+
+    start = time.perf_counter()
+    features = compute_risk_features(frame, window=window)
+    top = top_at_risk(features, 10)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'employee_weeks': len(frame),
+        'employees': len(features),
+        'seconds': elapsed,
+        'top_employee_ids': top.index.tolist(),
+    }
+
+def test_benchmark():
+    """Run the benchmark entry point on a small population."""
+    try:
+        result = benchmark(num_employees=200, num_weeks=20)
+        assert result['employees'] == 200
+        assert len(result['top_employee_ids']) == 10
+        print(f"✓ Scored {result['employee_weeks']:,} employee-weeks")
+        return True
+    
+    except Exception as e:
+        print(f"✗ Error running turnover benchmark: {e!r}")
+        return False
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"Scored {result['employee_weeks']:,} employee-weeks "
+          f"({result['employees']:,} employees) in {result['seconds']:.2f}s")
+    print(f"Highest-risk employees: {result['top_employee_ids']}")